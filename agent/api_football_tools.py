@@ -7,14 +7,26 @@ API-Football 工具函数集合
 import os
 import json
 import requests
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
 from typing import Dict, List, Union, Optional
+from concurrent.futures import ThreadPoolExecutor
 from langchain_core.tools import tool
+from data_fetcher.api_football import api_get
+from agent.tool_cache import get_cached, set_cached
+from agent.compact import encode_rows, encode_record
+from data_fetcher.standings import get_team_standing
+from data_fetcher.fixtures import get_fixture_row
+from data_fetcher.odds import get_latest_quotes, odds_refresh_interval
 
 # 加载环境变量
 load_dotenv()
 
+ODDS_BOOKMAKERS = ('William Hill', 'Ladbrokes', 'Bet365')
+MATCH_WINNER_BET_ID = 1
+# 本地最新赔率的最短有效期；实际有效期取该值与调度器在该开赛距离上的刷新间隔（加一个调度周期）中较大者
+ODDS_LOCAL_MAX_AGE = timedelta(seconds=int(os.getenv('ODDS_LOCAL_MAX_AGE_SECONDS', '10800')))
+
 class APIFootballClient:
     """API-Football客户端类"""
     
@@ -23,17 +35,11 @@ class APIFootballClient:
         self.api_key = os.getenv('API_FOOTBALL_KEY')
         if not self.api_key:
             raise ValueError("请在.env文件中设置API_FOOTBALL_KEY")
-        
-        # API-Football的基础URL和请求头
-        self.base_url = "https://v3.football.api-sports.io"
-        self.headers = {
-            'X-RapidAPI-Key': self.api_key,
-            'X-RapidAPI-Host': 'v3.football.api-sports.io'
-        }
     
     def _make_request(self, endpoint: str, params: dict) -> Optional[dict]:
         """
-        发送API请求的通用方法
+        发送API请求的通用方法，复用 data_fetcher.api_football 的进程内连接池、超时与重试，
+        并经过 Redis 读穿透缓存（按 endpoint 区分 TTL）
         
         Args:
             endpoint (str): API端点
@@ -42,15 +48,15 @@ class APIFootballClient:
         Returns:
             dict: API响应数据，失败时返回None
         """
-        url = f"{self.base_url}{endpoint}"
-        
+        cached = get_cached(endpoint, params)
+        if cached is not None:
+            return cached
         try:
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = api_get(endpoint, params)
+            # 只缓存没有错误信息的响应
+            if isinstance(data, dict) and not data.get('errors'):
+                set_cached(endpoint, params, data)
             return data
-            
         except requests.exceptions.RequestException as e:
             print(f"API请求失败: {e}")
             return None
@@ -61,6 +67,45 @@ class APIFootballClient:
 # 创建全局客户端实例
 _client = APIFootballClient()
 
+
+def _api_error(data: Optional[dict]) -> Optional[str]:
+    """请求失败或 API 返回错误信息时返回错误描述，正常响应（包括空列表）返回None"""
+    if data is None:
+        return 'API请求失败'
+    if 'response' not in data:
+        return 'API响应缺少response字段'
+    if data.get('errors'):
+        return f"API返回错误: {json.dumps(data['errors'], ensure_ascii=False)}"
+    return None
+
+def _fetch_fixture_basic_info_remote(fixture_id: int) -> Dict:
+    """从 API-Football 获取比赛基本信息，字段与 get_fixture_basic_info 相同"""
+    params = {'id': fixture_id}
+    data = _client._make_request('/fixtures', params)
+    
+    if _api_error(data) or not data['response']:
+        return {}
+    
+    fixture = data['response'][0]
+    
+    return {
+        'fixture_id': fixture['fixture']['id'],
+        'timezone': fixture['fixture']['timezone'],
+        'fixture_date': fixture['fixture']['date'],
+        'venue_name': fixture['fixture']['venue']['name'] if fixture['fixture']['venue'] else None,
+        'venue_city': fixture['fixture']['venue']['city'] if fixture['fixture']['venue'] else None,
+        'league_id': fixture['league']['id'],
+        'league_name': fixture['league']['name'],
+        'league_country': fixture['league']['country'],
+        'league_season': fixture['league']['season'],
+        'league_round': fixture['league']['round'],
+        'home_id': fixture['teams']['home']['id'],
+        'home_name': fixture['teams']['home']['name'],
+        'away_id': fixture['teams']['away']['id'],
+        'away_name': fixture['teams']['away']['name'],
+    }
+
+
 @tool
 def get_fixture_basic_info(fixture_id: int) -> Dict:
     """
@@ -86,30 +131,32 @@ def get_fixture_basic_info(fixture_id: int) -> Dict:
             - away_id (int): 客队id
             - away_name (str): 客队名称
     """
-    params = {'id': fixture_id}
-    data = _client._make_request('/fixtures', params)
-    
-    if not data or 'response' not in data or not data['response']:
-        return {}
-    
-    fixture = data['response'][0]
-    
-    return {
-        'fixture_id': fixture['fixture']['id'],
-        'timezone': fixture['fixture']['timezone'],
-        'fixture_date': fixture['fixture']['date'],
-        'venue_name': fixture['fixture']['venue']['name'] if fixture['fixture']['venue'] else None,
-        'venue_city': fixture['fixture']['venue']['city'] if fixture['fixture']['venue'] else None,
-        'league_id': fixture['league']['id'],
-        'league_name': fixture['league']['name'],
-        'league_country': fixture['league']['country'],
-        'league_season': fixture['league']['season'],
-        'league_round': fixture['league']['round'],
-        'home_id': fixture['teams']['home']['id'],
-        'home_name': fixture['teams']['home']['name'],
-        'away_id': fixture['teams']['away']['id'],
-        'away_name': fixture['teams']['away']['name'],
-    }
+    # 优先读本地 fixtures 表，本地没有时才请求 API
+    try:
+        row = get_fixture_row(fixture_id)
+    except Exception as e:
+        print(f"读取本地比赛信息失败: {e}")
+        row = None
+    # 后续工具需要的字段都齐全时才使用本地行，否则按 API 补全
+    required = ('league_id', 'season', 'home_team_id', 'away_team_id', 'match_date')
+    if row is not None and all(getattr(row, k) is not None for k in required):
+        return {
+            'fixture_id': row.fixture_id,
+            'timezone': 'UTC',
+            'fixture_date': row.match_date.isoformat(),
+            'venue_name': row.venue_name,
+            'venue_city': row.venue_city,
+            'league_id': row.league_id,
+            'league_name': row.league_name,
+            'league_country': row.country_name,
+            'league_season': row.season,
+            'league_round': row.round,
+            'home_id': row.home_team_id,
+            'home_name': row.home_team_name,
+            'away_id': row.away_team_id,
+            'away_name': row.away_team_name,
+        }
+    return _fetch_fixture_basic_info_remote(fixture_id)
 
 @tool
 def get_standing_home_info(league_id: int, season: int, home_team_id: int) -> Dict:
@@ -155,59 +202,8 @@ def get_standing_home_info(league_id: int, season: int, home_team_id: int) -> Di
             - away_goals_for (int): 客场进球
             - away_goals_against (int): 客场失球
     """
-    params = {
-        'league': league_id,
-        'season': season,
-        'team': home_team_id
-    }
-    
-    data = _client._make_request('/standings', params)
-    
-    if not data or 'response' not in data or not data['response']:
-        return {}
-    
-    # 查找指定球队的积分榜信息
-    for league_standing in data['response']:
-        league_info = league_standing['league']
-        
-        for standing_group in league_standing['league']['standings']:
-            for team_standing in standing_group:
-                if team_standing['team']['id'] == home_team_id:
-                    return {
-                        'league_id': league_info['id'],
-                        'league_name': league_info['name'],
-                        'league_country': league_info['country'],
-                        'league_season': league_info['season'],
-                        'team_id': team_standing['team']['id'],
-                        'team_name': team_standing['team']['name'],
-                        'rank': team_standing['rank'],
-                        'points': team_standing['points'],
-                        'goalsDiff': team_standing['goalsDiff'],
-                        'group': team_standing['group'],
-                        'form': team_standing['form'],
-                        'status': team_standing['status'],
-                        'description': team_standing['description'],
-                        'all_played': team_standing['all']['played'],
-                        'all_win': team_standing['all']['win'],
-                        'all_draw': team_standing['all']['draw'],
-                        'all_lose': team_standing['all']['lose'],
-                        'all_goals_for': team_standing['all']['goals']['for'],
-                        'all_goals_against': team_standing['all']['goals']['against'],
-                        'home_played': team_standing['home']['played'],
-                        'home_win': team_standing['home']['win'],
-                        'home_draw': team_standing['home']['draw'],
-                        'home_lose': team_standing['home']['lose'],
-                        'home_goals_for': team_standing['home']['goals']['for'],
-                        'home_goals_against': team_standing['home']['goals']['against'],
-                        'away_played': team_standing['away']['played'],
-                        'away_win': team_standing['away']['win'],
-                        'away_draw': team_standing['away']['draw'],
-                        'away_lose': team_standing['away']['lose'],
-                        'away_goals_for': team_standing['away']['goals']['for'],
-                        'away_goals_against': team_standing['away']['goals']['against'],
-                    }
-    
-    return {}
+    # 整个联赛积分榜按 (league, season) 下载一次并按 team_id 存在本地表里，这里只做本地查找
+    return encode_record(get_team_standing(league_id, season, home_team_id))
 
 @tool
 def get_standing_away_info(league_id: int, season: int, away_team_id: int) -> Dict:
@@ -253,62 +249,10 @@ def get_standing_away_info(league_id: int, season: int, away_team_id: int) -> Di
             - away_goals_for (int): 客场进球数
             - away_goals_against (int): 客场失球数
     """
-    params = {
-        'league': league_id,
-        'season': season,
-        'team': away_team_id
-    }
-    
-    data = _client._make_request('/standings', params)
-    
-    if not data or 'response' not in data or not data['response']:
-        return {}
-    
-    # 查找指定球队的积分榜信息
-    for league_standing in data['response']:
-        league_info = league_standing['league']
-        
-        for standing_group in league_standing['league']['standings']:
-            for team_standing in standing_group:
-                if team_standing['team']['id'] == away_team_id:
-                    return {
-                        'league_id': league_info['id'],
-                        'league_name': league_info['name'],
-                        'league_country': league_info['country'],
-                        'league_season': league_info['season'],
-                        'team_id': team_standing['team']['id'],
-                        'team_name': team_standing['team']['name'],
-                        'rank': team_standing['rank'],
-                        'points': team_standing['points'],
-                        'goalsDiff': team_standing['goalsDiff'],
-                        'group': team_standing['group'],
-                        'form': team_standing['form'],
-                        'status': team_standing['status'],
-                        'description': team_standing['description'],
-                        'all_played': team_standing['all']['played'],
-                        'all_win': team_standing['all']['win'],
-                        'all_draw': team_standing['all']['draw'],
-                        'all_lose': team_standing['all']['lose'],
-                        'all_goals_for': team_standing['all']['goals']['for'],
-                        'all_goals_against': team_standing['all']['goals']['against'],
-                        'home_played': team_standing['home']['played'],
-                        'home_win': team_standing['home']['win'],
-                        'home_draw': team_standing['home']['draw'],
-                        'home_lose': team_standing['home']['lose'],
-                        'home_goals_for': team_standing['home']['goals']['for'],
-                        'home_goals_against': team_standing['home']['goals']['against'],
-                        'away_played': team_standing['away']['played'],
-                        'away_win': team_standing['away']['win'],
-                        'away_draw': team_standing['away']['draw'],
-                        'away_lose': team_standing['away']['lose'],
-                        'away_goals_for': team_standing['away']['goals']['for'],
-                        'away_goals_against': team_standing['away']['goals']['against'],
-                    }
-    
-    return {}
+    return encode_record(get_team_standing(league_id, season, away_team_id))
 
 @tool
-def get_fixture_head2head(home_id: int, away_id: int, last: int = 10) -> List[Dict]:
+def get_fixture_head2head(home_id: int, away_id: int, last: int = 10) -> Union[List[Dict], Dict]:
     """
     通过主队id和客队id获取最近比赛的head-to-head信息。
     
@@ -318,7 +262,7 @@ def get_fixture_head2head(home_id: int, away_id: int, last: int = 10) -> List[Di
         last (int, optional): 最近比赛场次，默认10场
         
     Returns:
-        list: 包含历史对战记录的列表，每个元素包含以下字段：
+        list | dict: 包含历史对战记录的列表（TOOL_OUTPUT_FORMAT=compact 时编码为 {shared, columns, rows} 表格；请求失败时返回 {'error': ...}），每个元素包含以下字段：
             - home_team_id (int): 主队id
             - away_team_id (int): 客队id
             - fixture_date (str): 比赛日期
@@ -335,8 +279,9 @@ def get_fixture_head2head(home_id: int, away_id: int, last: int = 10) -> List[Di
     
     data = _client._make_request('/fixtures/headtohead', params)
     
-    if not data or 'response' not in data:
-        return []
+    error = _api_error(data)
+    if error:
+        return {'error': error}
     
     extracted_matches = []
     
@@ -355,10 +300,10 @@ def get_fixture_head2head(home_id: int, away_id: int, last: int = 10) -> List[Di
         except KeyError:
             continue
     
-    return extracted_matches
+    return encode_rows(extracted_matches)
 
 @tool
-def get_home_last_10(home_id: int) -> List[Dict]:
+def get_home_last_10(home_id: int) -> Union[List[Dict], Dict]:
     """
     通过主队id获取最近10场比赛的信息。
     
@@ -366,7 +311,7 @@ def get_home_last_10(home_id: int) -> List[Dict]:
         home_id (int): 主队id
         
     Returns:
-        list: 包含最近10场比赛信息的列表，每个元素包含以下字段：
+        list | dict: 包含最近10场比赛信息的列表（TOOL_OUTPUT_FORMAT=compact 时编码为 {shared, columns, rows} 表格；请求失败时返回 {'error': ...}），每个元素包含以下字段：
             - fixture_id (int): 比赛ID
             - fixture_date (str): 比赛日期
             - status (str): 比赛状态
@@ -390,8 +335,9 @@ def get_home_last_10(home_id: int) -> List[Dict]:
     
     data = _client._make_request('/fixtures', params)
     
-    if not data or 'response' not in data:
-        return []
+    error = _api_error(data)
+    if error:
+        return {'error': error}
     
     extracted_fixtures = []
     
@@ -417,10 +363,10 @@ def get_home_last_10(home_id: int) -> List[Dict]:
         except KeyError:
             continue
     
-    return extracted_fixtures
+    return encode_rows(extracted_fixtures)
 
 @tool
-def get_away_last_10(away_id: int) -> List[Dict]:
+def get_away_last_10(away_id: int) -> Union[List[Dict], Dict]:
     """
     通过客队id获取最近10场比赛的信息。
     
@@ -428,7 +374,7 @@ def get_away_last_10(away_id: int) -> List[Dict]:
         away_id (int): 客队id
         
     Returns:
-        list: 包含最近10场比赛信息的列表，每个元素包含以下字段：
+        list | dict: 包含最近10场比赛信息的列表（TOOL_OUTPUT_FORMAT=compact 时编码为 {shared, columns, rows} 表格；请求失败时返回 {'error': ...}），每个元素包含以下字段：
             - fixture_id (int): 比赛ID
             - fixture_date (str): 比赛日期
             - status (str): 比赛状态
@@ -452,8 +398,9 @@ def get_away_last_10(away_id: int) -> List[Dict]:
     
     data = _client._make_request('/fixtures', params)
     
-    if not data or 'response' not in data:
-        return []
+    error = _api_error(data)
+    if error:
+        return {'error': error}
     
     extracted_fixtures = []
     
@@ -479,10 +426,10 @@ def get_away_last_10(away_id: int) -> List[Dict]:
         except KeyError:
             continue
     
-    return extracted_fixtures
+    return encode_rows(extracted_fixtures)
 
 @tool
-def get_injuries(fixture_id: int) -> List[Dict]:
+def get_injuries(fixture_id: int) -> Union[List[Dict], Dict]:
     """
     通过fixture_id获取比赛相关的伤病信息。
     
@@ -490,13 +437,13 @@ def get_injuries(fixture_id: int) -> List[Dict]:
         fixture_id (int): 比赛id
         
     Returns:
-        list: 包含伤病信息的列表，每个元素包含以下字段：
+        list | dict: 包含伤病信息的列表（TOOL_OUTPUT_FORMAT=compact 时编码为 {shared, columns, rows} 表格；请求失败时返回 {'error': ...}），每个元素包含以下字段：
             - player_id (int): 球员ID
             - player_name (str): 球员姓名
-            - player_photo (str): 球员照片链接
+            - player_photo (str): 球员照片链接（compact 模式下省略）
             - team_id (int): 球队ID
             - team_name (str): 球队名称
-            - team_logo (str): 球队队徽链接
+            - team_logo (str): 球队队徽链接（compact 模式下省略）
             - injury_type (str): 伤病类型
             - injury_reason (str): 伤病原因
             - fixture_id (int): 比赛ID
@@ -504,7 +451,7 @@ def get_injuries(fixture_id: int) -> List[Dict]:
             - league_id (int): 联赛ID
             - league_name (str): 联赛名称
             - league_country (str): 联赛所属国家
-            - league_logo (str): 联赛标志链接
+            - league_logo (str): 联赛标志链接（compact 模式下省略）
             - season (int): 赛季
     """
     params = {
@@ -514,8 +461,9 @@ def get_injuries(fixture_id: int) -> List[Dict]:
     
     data = _client._make_request('/injuries', params)
     
-    if not data or 'response' not in data:
-        return []
+    error = _api_error(data)
+    if error:
+        return {'error': error}
     
     extracted_injuries = []
     
@@ -542,7 +490,7 @@ def get_injuries(fixture_id: int) -> List[Dict]:
         except KeyError:
             continue
     
-    return extracted_injuries
+    return encode_rows(extracted_injuries)
 
 
 @tool
@@ -563,9 +511,82 @@ def get_fixture_odds(fixture_id: int) -> Dict:
                 "Bet365": {"home": <float>, "draw": <float>, "away": <float>} | None
               }
             }
+            请求 API 失败时额外带 "error" 字段
     """
+    # 优先使用本地 odds_latest 中每家公司最新的报价，缺失或过期时才请求 API
+    try:
+        local = _local_fixture_odds(fixture_id)
+    except Exception as e:
+        print(f"读取本地赔率失败: {e}")
+        local = None
+    if local is not None:
+        return local
+    return _fetch_fixture_odds_remote(fixture_id)
+
+
+def _norm_odds_key(v):
+    if v is None:
+        return None
+    s = str(v).strip().lower()
+    if s in {'home', '1'}:
+        return 'home'
+    if s in {'draw', 'x'}:
+        return 'draw'
+    if s in {'away', '2'}:
+        return 'away'
+    return None
+
+
+def _local_odds_max_age(fixture_id: int) -> timedelta:
+    """与 schedule_odds_refresh 的刷新档位保持一致，避免在两次计划刷新之间把本地赔率判为过期"""
+    row = get_fixture_row(fixture_id)
+    if row is None or row.match_date is None:
+        return ODDS_LOCAL_MAX_AGE
+    tick = timedelta(minutes=int(os.getenv('ODDS_SCHEDULER_TICK_MINUTES', '5')))
+    return max(ODDS_LOCAL_MAX_AGE, odds_refresh_interval(row.match_date - datetime.now(timezone.utc)) + tick)
+
+
+def _local_fixture_odds(fixture_id: int) -> Optional[Dict]:
+    """从本地 odds_latest 组装与 get_fixture_odds 相同的结构；没有数据或数据过期时返回None"""
+    quotes = get_latest_quotes(fixture_id, MATCH_WINNER_BET_ID, set(ODDS_BOOKMAKERS))
+    if not quotes:
+        return None
+    latest = max((q.fetched_at or q.update_time) for q in quotes)
+    if latest < datetime.now(timezone.utc) - _local_odds_max_age(fixture_id):
+        return None
+    result_odds: Dict[str, Dict[str, float] | None] = {name: None for name in ODDS_BOOKMAKERS}
+    for q in quotes:
+        key = _norm_odds_key(q.selection)
+        if key is None or q.odd is None:
+            continue
+        try:
+            value = float(str(q.odd))
+        except ValueError:
+            continue
+        if result_odds.get(q.bookmaker_name) is None:
+            result_odds[q.bookmaker_name] = {}
+        result_odds[q.bookmaker_name][key] = value
+    return {
+        'fixture_id': fixture_id,
+        'odds': result_odds
+    }
+
+
+def _fetch_fixture_odds_remote(fixture_id: int) -> Dict:
+    """从 API-Football 获取三家公司的欧赔，结构与 get_fixture_odds 相同"""
     data = _client._make_request('/odds', {'fixture': fixture_id})
-    if not data or 'response' not in data or not data['response']:
+    error = _api_error(data)
+    if error:
+        return {
+            'fixture_id': fixture_id,
+            'odds': {
+                'William Hill': None,
+                'Ladbrokes': None,
+                'Bet365': None,
+            },
+            'error': error,
+        }
+    if not data['response']:
         return {
             'fixture_id': fixture_id,
             'odds': {
@@ -580,21 +601,9 @@ def get_fixture_odds(fixture_id: int) -> Dict:
         bookmakers = base.get('bookmakers', [])
         # 优先使用响应中的 fixture.id
         fx_id = base.get('fixture', {}).get('id', fixture_id)
-        allowed = {'William Hill', 'Ladbrokes', 'Bet365'}
+        allowed = set(ODDS_BOOKMAKERS)
         result_odds: Dict[str, Dict[str, float] | None] = {name: None for name in allowed}
 
-        def norm_key(v):
-            if v is None:
-                return None
-            s = str(v).strip().lower()
-            if s in {'home', '1'}:
-                return 'home'
-            if s in {'draw', 'x'}:
-                return 'draw'
-            if s in {'away', '2'}:
-                return 'away'
-            return None
-
         for bm in bookmakers:
             name = bm.get('name')
             if name not in allowed:
@@ -602,7 +611,7 @@ def get_fixture_odds(fixture_id: int) -> Dict:
             bets = bm.get('bets', [])
             target = None
             for bet in bets:
-                if bet.get('name') == 'Match Winner' or bet.get('id') == 1:
+                if bet.get('name') == 'Match Winner' or bet.get('id') == MATCH_WINNER_BET_ID:
                     target = bet
                     break
             if not target:
@@ -611,7 +620,7 @@ def get_fixture_odds(fixture_id: int) -> Dict:
             values = target.get('values', [])
             odds_map: Dict[str, float] = {}
             for item in values:
-                key = norm_key(item.get('value'))
+                key = _norm_odds_key(item.get('value'))
                 odd = item.get('odd')
                 if key is None or odd is None:
                     continue
@@ -627,13 +636,47 @@ def get_fixture_odds(fixture_id: int) -> Dict:
             'fixture_id': fx_id,
             'odds': result_odds
         }
-    except Exception:
-        # 出错时兜底返回空结构
+    except Exception as e:
+        # 出错时兜底返回空结构，并带上错误信息
         return {
             'fixture_id': fixture_id,
             'odds': {
                 'William Hill': None,
                 'Ladbrokes': None,
                 'Bet365': None,
-            }
-        }
\ No newline at end of file
+            },
+            'error': f"{type(e).__name__}: {e}",
+        }
+
+def prefetch_fixture_inputs(fixture_id: int) -> Dict:
+    """
+    一次性并行获取基本面报告需要的全部数据。
+    先通过 get_fixture_basic_info 解析出联赛、赛季和主客队id，再并行调用其余工具。
+    
+    Args:
+        fixture_id (int): 比赛ID
+        
+    Returns:
+        dict: 以工具名为键、工具返回值为键值的字典；单个工具失败时对应值为 {'error': ...}
+    """
+    basic = get_fixture_basic_info.invoke({'fixture_id': fixture_id})
+    results: Dict = {'get_fixture_basic_info': basic}
+    if not basic:
+        return results
+    calls = {
+        'get_standing_home_info': (get_standing_home_info, {'league_id': basic['league_id'], 'season': basic['league_season'], 'home_team_id': basic['home_id']}),
+        'get_standing_away_info': (get_standing_away_info, {'league_id': basic['league_id'], 'season': basic['league_season'], 'away_team_id': basic['away_id']}),
+        'get_fixture_head2head': (get_fixture_head2head, {'home_id': basic['home_id'], 'away_id': basic['away_id']}),
+        'get_home_last_10': (get_home_last_10, {'home_id': basic['home_id']}),
+        'get_away_last_10': (get_away_last_10, {'away_id': basic['away_id']}),
+        'get_injuries': (get_injuries, {'fixture_id': fixture_id}),
+        'get_fixture_odds': (get_fixture_odds, {'fixture_id': fixture_id}),
+    }
+    with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+        futures = {name: executor.submit(t.invoke, args) for name, (t, args) in calls.items()}
+    for name, future in futures.items():
+        try:
+            results[name] = future.result()
+        except Exception as e:
+            results[name] = {'error': f"{type(e).__name__}: {e}"}
+    return results
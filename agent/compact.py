@@ -0,0 +1,88 @@
+"""
+工具返回值的紧凑编码
+列表型结果（近10场、交锋、伤停）改为表格形式：共享表头 + 行数组，所有行取值相同的列提到 shared 中只出现一次，
+以减少反复发送给 LLM 的 prompt token
+"""
+
+import os
+import json
+from typing import Any, Dict, List
+
+TOOL_OUTPUT_FORMAT = os.getenv("TOOL_OUTPUT_FORMAT", "json")
+
+# 对分析没有帮助的图片链接，紧凑编码时直接去掉
+DROPPED_KEYS = {"player_photo", "team_logo", "league_logo"}
+
+
+def compact_enabled() -> bool:
+    return TOOL_OUTPUT_FORMAT == "compact"
+
+
+def compact_rows(rows: List[Dict]) -> Any:
+    """
+    将 list[dict] 编码为 {'shared': {...}, 'columns': [...], 'rows': [[...], ...]}，并去掉 DROPPED_KEYS 中的列。
+    
+    Args:
+        rows (list): 每个元素为字段相同的字典
+        
+    Returns:
+        dict | list: 紧凑结构；输入为空或不是字典列表时原样返回
+    """
+    if not rows or not all(isinstance(r, dict) for r in rows):
+        return rows
+    columns: List[str] = []
+    for r in rows:
+        for k in r:
+            if k not in columns and k not in DROPPED_KEYS:
+                columns.append(k)
+    shared = {}
+    if len(rows) > 1:
+        for c in columns:
+            first = rows[0].get(c)
+            if all(r.get(c) == first for r in rows[1:]):
+                shared[c] = first
+    varying = [c for c in columns if c not in shared]
+    out: Dict[str, Any] = {"columns": varying, "rows": [[r.get(c) for c in varying] for r in rows]}
+    if shared:
+        out["shared"] = {k: v for k, v in shared.items() if v is not None}
+    return out
+
+
+def expand_rows(value: Any) -> Any:
+    """
+    compact_rows 的逆操作，将表格结构还原为 list[dict]。
+    
+    Args:
+        value: compact_rows 的输出或任意值
+        
+    Returns:
+        list | Any: 还原后的字典列表；不是紧凑结构时原样返回。shared 中为 None 的列已被丢弃，还原后不包含这些键
+    """
+    if not isinstance(value, dict) or set(value) - {"shared", "columns", "rows"} or not {"columns", "rows"} <= set(value):
+        return value
+    shared = value.get("shared") or {}
+    return [{**shared, **dict(zip(value["columns"], row))} for row in value["rows"]]
+
+
+def encode_rows(rows: List[Dict]) -> Any:
+    """按 TOOL_OUTPUT_FORMAT 决定是否对列表型工具结果做紧凑编码"""
+    return compact_rows(rows) if compact_enabled() else rows
+
+
+def compact_record(record: Dict) -> Dict:
+    """去掉值为 None 的字段和 DROPPED_KEYS 中的字段"""
+    if not isinstance(record, dict):
+        return record
+    return {k: v for k, v in record.items() if v is not None and k not in DROPPED_KEYS}
+
+
+def encode_record(record: Dict) -> Dict:
+    """按 TOOL_OUTPUT_FORMAT 决定是否对单条记录做紧凑编码"""
+    return compact_record(record) if compact_enabled() else record
+
+
+def dumps(data: Any) -> str:
+    """紧凑模式下使用无空白的 JSON 分隔符"""
+    if compact_enabled():
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str)
+    return json.dumps(data, ensure_ascii=False, default=str)
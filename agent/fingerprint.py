@@ -0,0 +1,75 @@
+"""
+AI 评估输入指纹
+对预取到的工具数据做归一化后计算哈希，只有输入发生有意义的变化时才需要重新跑 LLM
+"""
+
+import os
+import json
+import hashlib
+from typing import Any, Dict, List
+
+from agent.compact import expand_rows, DROPPED_KEYS
+
+# 赔率按该步长取整，小幅波动不触发重新评估
+ODDS_STEP = float(os.getenv("AI_EVAL_ODDS_STEP", "0.1"))
+
+# 与预测无关、但经常变化的字段（图片链接等）
+IGNORED_KEYS = DROPPED_KEYS | {"status"}
+
+
+def _round_odds(odds: Dict) -> Dict:
+    out = {}
+    for bookmaker, prices in (odds or {}).items():
+        if not prices:
+            out[bookmaker] = None
+            continue
+        out[bookmaker] = {k: round(round(float(v) / ODDS_STEP) * ODDS_STEP, 4) for k, v in prices.items()}
+    return out
+
+
+def _normalize(value: Any) -> Any:
+    # 先还原紧凑编码；值为 None 的字段一律丢弃，使 json / compact 两种输出格式得到相同指纹
+    value = expand_rows(value)
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items() if k not in IGNORED_KEYS and v is not None}
+    if isinstance(value, list):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def incomplete_inputs(inputs: Dict) -> List[str]:
+    """
+    返回获取失败的工具名列表；比赛基本信息为空或任一工具结果带 error 时视为输入不完整。
+    
+    Args:
+        inputs (dict): prefetch_fixture_inputs 的结果
+        
+    Returns:
+        list: 失败的工具名，为空表示输入完整
+    """
+    data = inputs or {}
+    failed = [] if data.get("get_fixture_basic_info") else ["get_fixture_basic_info"]
+    failed += [name for name, value in data.items() if isinstance(value, dict) and value.get("error")]
+    return failed
+
+
+def input_fingerprint(inputs: Dict) -> str:
+    """
+    计算 prefetch_fixture_inputs 结果的指纹。
+    
+    Args:
+        inputs (dict): 以工具名为键的预取数据
+        
+    Returns:
+        str: sha256 十六进制字符串
+    """
+    data = dict(inputs or {})
+    odds = data.get("get_fixture_odds")
+    if isinstance(odds, dict) and "odds" in odds:
+        data["get_fixture_odds"] = {**odds, "odds": _round_odds(odds["odds"])}
+    # 伤停列表顺序不稳定，按球员排序
+    injuries = expand_rows(data.get("get_injuries"))
+    if isinstance(injuries, list):
+        data["get_injuries"] = sorted(injuries, key=lambda x: (x.get("team_id") or 0, x.get("player_id") or 0))
+    payload = json.dumps(_normalize(data), ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
@@ -4,13 +4,15 @@ from langchain_core.tools import tool
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.messages import HumanMessage
+import operator
 from typing import Dict, Annotated, Sequence
 from typing_extensions import TypedDict
 from langchain_core.tools import tool
 from langgraph.graph import StateGraph, START, END, MessagesState
 from langgraph.prebuilt import ToolNode
 load_dotenv()
-from agent.api_football_tools import get_fixture_basic_info, get_standing_home_info, get_standing_away_info, get_fixture_head2head, get_home_last_10, get_away_last_10, get_injuries, get_fixture_odds
+from agent.api_football_tools import get_fixture_basic_info, get_standing_home_info, get_standing_away_info, get_fixture_head2head, get_home_last_10, get_away_last_10, get_injuries, get_fixture_odds, prefetch_fixture_inputs
+from agent.compact import dumps as dump_context
 
 # 模型初始化
 # 注意：langchain-openai 1.0.x 使用参数 `model` 而不是 `model_name`
@@ -43,6 +45,13 @@ class AgentState(MessagesState):
     languages: Sequence[str] | None = None
     translations: Dict[str, Dict[str, str]] | None = None
     strategy: str | None = None
+    prefetched: Dict | None = None
+    # 各节点 LLM 调用的输入 token 累计
+    prompt_tokens: Annotated[int, operator.add]
+
+def _input_tokens(message) -> int:
+    usage = getattr(message, "usage_metadata", None) or {}
+    return int(usage.get("input_tokens") or 0)
 
 def create_evaluator_node(llm):
     def evaluator_node(state: AgentState):
@@ -78,6 +87,7 @@ def create_evaluator_node(llm):
                 "predict_winner": prediction_data.get("predict_winner"),
                 "confidence": prediction_data.get("confidence"),
                 "key_tag_evidence": prediction_data.get("key_tag_evidence"),
+                "prompt_tokens": _input_tokens(result),
             }
         except Exception:
             return {
@@ -85,6 +95,7 @@ def create_evaluator_node(llm):
                 "predict_winner": None,
                 "confidence": None,
                 "key_tag_evidence": None,
+                "prompt_tokens": _input_tokens(result),
             }
     return evaluator_node
 
@@ -105,25 +116,34 @@ def create_translator_node(llm):
         if not pairs:
             return {}
         translations: Dict[str, Dict[str, str]] = {}
-        for name, locale in pairs:
-            prompt_template = ChatPromptTemplate.from_messages([
-                (
-                    "system",
-                    "Translate the content to {target_name} (locale {target_locale}). Return a single-line valid JSON object with keys: 'report', 'predict_winner', 'key_tag_evidence'. Do not include markdown fences or extra text.",
-                ),
-                (
-                    "human",
-                    '{{"report": "{report}", "predict_winner": "{predict_winner}", "key_tag_evidence": "{key_tag_evidence}"}}',
-                ),
-            ])
-            chain = prompt_template | llm
-            result = chain.invoke({
+        prompt_template = ChatPromptTemplate.from_messages([
+            (
+                "system",
+                "Translate the content to {target_name} (locale {target_locale}). Return a single-line valid JSON object with keys: 'report', 'predict_winner', 'key_tag_evidence'. Do not include markdown fences or extra text.",
+            ),
+            (
+                "human",
+                '{{"report": "{report}", "predict_winner": "{predict_winner}", "key_tag_evidence": "{key_tag_evidence}"}}',
+            ),
+        ])
+        chain = prompt_template | llm
+        inputs = [
+            {
                 "target_name": name,
                 "target_locale": locale,
                 "report": report,
                 "predict_winner": predict_winner or "",
                 "key_tag_evidence": key_tag_evidence or "",
-            })
+            }
+            for name, locale in pairs
+        ]
+        # 各语言并发翻译，单个语言调用失败不影响其他语言
+        max_concurrency = int(os.getenv("TRANSLATION_MAX_CONCURRENCY", "6"))
+        results = chain.batch(inputs, config={"max_concurrency": max_concurrency}, return_exceptions=True)
+        for (name, _), result in zip(pairs, results):
+            if isinstance(result, Exception):
+                print(f"翻译失败 {name}: {result}")
+                continue
             try:
                 import json
                 data = json.loads(result.content)
@@ -138,9 +158,50 @@ def create_translator_node(llm):
                     "predict_winner": "",
                     "key_tag_evidence": "",
                 }
-        return {"languages": [n for n, _ in pairs], "translations": translations}
+        prompt_tokens = sum(_input_tokens(r) for r in results if not isinstance(r, Exception))
+        return {"languages": [n for n, _ in pairs if n in translations], "translations": translations, "prompt_tokens": prompt_tokens}
     return translator_node
 
+REPORT_INSTRUCTIONS = (
+    "你是一名研究员, 负责分析一场足球比赛的基本面信息. 请用英文撰写一份全面的足球比赛的基本面信息报告, 内容包括球队实力面, 球队近期状态, 阵容与伤停, 战意, 以便下注者全面了解这场足球比赛. 确保包含尽可能多的细节，不要简单陈述趋势好坏，需提供详细且精细的分析与见解，以帮助交易者做出决策。"
+    + "请在报告末尾附加一个Markdown表格，用于整理报告中的关键要点，确保内容条理清晰、易于阅读。"
+)
+
+# 预取节点：一次性并行拉取全部工具数据，替代多轮 LLM 工具调用
+def create_prefetch_node():
+    def prefetch_node(state: AgentState):
+        if state.get("prefetched"):
+            return {}
+        return {"prefetched": prefetch_fixture_inputs(int(state["fixture_id"]))}
+    return prefetch_node
+
+# 预取模式下的 analyst：所有数据放在一条上下文消息里，单次 LLM 调用写出报告
+def create_prefetched_fundamentals_analyst(llm):
+    def prefetched_analyst_node(state: AgentState):
+        fixture_id = state["fixture_id"]
+        prompt = ChatPromptTemplate.from_messages([
+            (
+                "system",
+                "{system_message}"
+                " 以下数据已经通过工具预先获取（键为工具名，值为工具返回结果），请直接基于这些数据撰写报告。"
+                " 供你参考，我们要分析的比赛id是{fixture_id}",
+            ),
+            ("human", "{context}"),
+        ])
+        chain = prompt | llm
+        context = dump_context(state.get("prefetched") or {})
+        result = chain.invoke({
+            "system_message": REPORT_INSTRUCTIONS,
+            "fixture_id": fixture_id,
+            "context": context,
+        })
+        return {
+            "messages": [result],
+            "fundamentals_report": result.content,
+            "prompt_tokens": _input_tokens(result),
+        }
+    return prefetched_analyst_node
+
 # 创建fundamentals analyst 节点函数
 def create_fundamentals_analyst(llm):
     def fundamentals_analyst_node(state):
@@ -162,8 +223,7 @@ def create_fundamentals_analyst(llm):
         ]
 
         system_message = (
-            "你是一名研究员, 负责分析一场足球比赛的基本面信息. 请用英文撰写一份全面的足球比赛的基本面信息报告, 内容包括球队实力面, 球队近期状态, 阵容与伤停, 战意, 以便下注者全面了解这场足球比赛. 确保包含尽可能多的细节，不要简单陈述趋势好坏，需提供详细且精细的分析与见解，以帮助交易者做出决策。"
-            + "请在报告末尾附加一个Markdown表格，用于整理报告中的关键要点，确保内容条理清晰、易于阅读。"
+            REPORT_INSTRUCTIONS
             + "请使用以下可用工具: "
             + "get_fixture_head2head: 获取主队和客队的最近比赛记录."
             + "get_home_last_10: 获取主队最近10场比赛记录."
@@ -204,6 +264,7 @@ def create_fundamentals_analyst(llm):
         return {
             "messages": [result],
             "fundamentals_report": report,
+            "prompt_tokens": _input_tokens(result),
         }
 
     return fundamentals_analyst_node
@@ -236,14 +297,31 @@ tools = [
 
 tool_node = ToolNode(tools=tools)
 
-def create_fundamentals_graph():
-
-    # 创建节点
-    fundamentals_analyst = create_fundamentals_analyst(llm)
+def create_fundamentals_graph(mode: str | None = None):
+    """mode=tools: LLM 多轮调用工具（默认）；mode=prefetch: 先并行预取全部数据，再单次调用 LLM 撰写报告"""
+    mode = mode or os.getenv("FUNDAMENTALS_MODE", "tools")
     msg_clear = create_msg_delete()
     evaluator = create_evaluator_node(llm)
     translator = create_translator_node(llm)
 
+    if mode == "prefetch":
+        workflow = StateGraph(AgentState)
+        workflow.add_node("Prefetch", create_prefetch_node())
+        workflow.add_node("Fundamentals Analyst", create_prefetched_fundamentals_analyst(llm))
+        workflow.add_node("Msg Clear Fundamentals", msg_clear)
+        workflow.add_node("evaluator", evaluator)
+        workflow.add_node("translator", translator)
+        workflow.add_edge(START, "Prefetch")
+        workflow.add_edge("Prefetch", "Fundamentals Analyst")
+        workflow.add_edge("Fundamentals Analyst", "Msg Clear Fundamentals")
+        workflow.add_edge("Msg Clear Fundamentals", "evaluator")
+        workflow.add_edge("evaluator", "translator")
+        workflow.add_edge("translator", END)
+        return workflow.compile()
+
+    # 创建节点
+    fundamentals_analyst = create_fundamentals_analyst(llm)
+
     # 创建工作流
     workflow = StateGraph(AgentState)
 
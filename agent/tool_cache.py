@@ -0,0 +1,67 @@
+"""
+Agent 工具调用的 Redis 读穿透缓存
+按 endpoint + 归一化参数作为键，不同 endpoint 使用不同 TTL，并统计命中/未命中次数
+"""
+
+import os
+import json
+from typing import Optional
+
+import redis
+
+from data_fetcher.redis_client import get_redis, params_digest, record_hit, hit_miss_stats
+
+CACHE_PREFIX = "apifootball:cache"
+STATS_KEY = "apifootball:cache:stats"
+
+# 各类数据的变化频率不同：积分榜/交锋记录按小时，伤停按分钟，赔率很短
+ENDPOINT_TTLS = {
+    "/standings": int(os.getenv("TOOL_CACHE_TTL_STANDINGS", str(6 * 3600))),
+    "/fixtures/headtohead": int(os.getenv("TOOL_CACHE_TTL_HEAD2HEAD", str(12 * 3600))),
+    "/fixtures": int(os.getenv("TOOL_CACHE_TTL_FIXTURES", str(30 * 60))),
+    "/injuries": int(os.getenv("TOOL_CACHE_TTL_INJURIES", str(15 * 60))),
+    "/odds": int(os.getenv("TOOL_CACHE_TTL_ODDS", str(5 * 60))),
+}
+DEFAULT_TTL = int(os.getenv("TOOL_CACHE_TTL_DEFAULT", str(10 * 60)))
+
+
+def cache_key(endpoint: str, params: dict) -> str:
+    """参数归一化规则见 data_fetcher.redis_client.params_digest"""
+    return f"{CACHE_PREFIX}:{endpoint}:{params_digest(params)}"
+
+
+def ttl_for(endpoint: str) -> int:
+    return ENDPOINT_TTLS.get(endpoint, DEFAULT_TTL)
+
+
+def get_cached(endpoint: str, params: dict) -> Optional[dict]:
+    """读取缓存并记录命中/未命中；Redis 不可用时视为未命中"""
+    r = get_redis()
+    if r is None:
+        return None
+    try:
+        raw = r.get(cache_key(endpoint, params))
+    except redis.RedisError:
+        return None
+    record_hit(STATS_KEY, endpoint, raw is not None)
+    if raw is None:
+        return None
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return None
+
+
+def set_cached(endpoint: str, params: dict, data: dict) -> None:
+    r = get_redis()
+    if r is None:
+        return
+    try:
+        r.set(cache_key(endpoint, params), json.dumps(data, ensure_ascii=False), ex=ttl_for(endpoint))
+    except redis.RedisError:
+        pass
+
+
+def cache_stats() -> dict:
+    """返回 {endpoint: {'hit': n, 'miss': n, 'hit_rate': x}}"""
+    return hit_miss_stats(STATS_KEY)
@@ -0,0 +1,31 @@
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "standings",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("league_id", sa.Integer(), nullable=False),
+        sa.Column("season", sa.Integer(), nullable=False),
+        sa.Column("team_id", sa.Integer(), nullable=False),
+        sa.Column("rank", sa.Integer()),
+        sa.Column("points", sa.Integer()),
+        sa.Column("data", sa.JSON(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_unique_constraint(
+        "uq_standings_league_season_team",
+        "standings",
+        ["league_id", "season", "team_id"],
+    )
+
+
+def downgrade():
+    op.drop_constraint("uq_standings_league_season_team", "standings", type_="unique")
+    op.drop_table("standings")
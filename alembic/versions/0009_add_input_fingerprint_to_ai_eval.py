@@ -0,0 +1,18 @@
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "ai_eval",
+        sa.Column("input_fingerprint", sa.String(length=64), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_column("ai_eval", "input_fingerprint")
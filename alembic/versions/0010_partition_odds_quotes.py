@@ -0,0 +1,118 @@
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 旧表改名保留数据，释放原有约束、索引和序列名
+    op.execute("ALTER TABLE odds_quotes RENAME TO odds_quotes_legacy")
+    op.execute("ALTER TABLE odds_quotes_legacy RENAME CONSTRAINT uq_odds_quotes_unique TO uq_odds_quotes_legacy_unique")
+    op.execute("ALTER TABLE odds_quotes_legacy RENAME CONSTRAINT odds_quotes_pkey TO odds_quotes_legacy_pkey")
+    op.execute("ALTER INDEX ix_odds_quotes_fixture RENAME TO ix_odds_quotes_legacy_fixture")
+    op.execute("ALTER INDEX ix_odds_quotes_bookmaker_bet RENAME TO ix_odds_quotes_legacy_bookmaker_bet")
+    op.execute("ALTER SEQUENCE odds_quotes_id_seq RENAME TO odds_quotes_legacy_id_seq")
+
+    # 按 update_time 月分区；update_time 改为 NOT NULL，唯一约束才能真正去重
+    op.execute(
+        """
+        CREATE TABLE odds_quotes (
+          id BIGSERIAL NOT NULL,
+          fixture_id INTEGER NOT NULL,
+          bookmaker_id INTEGER,
+          bookmaker_name VARCHAR(255),
+          bet_id INTEGER,
+          bet_name VARCHAR(255),
+          selection VARCHAR(255),
+          odd NUMERIC(10, 3),
+          update_time TIMESTAMPTZ NOT NULL,
+          created_at TIMESTAMPTZ DEFAULT now(),
+          CONSTRAINT odds_quotes_pkey PRIMARY KEY (id, update_time),
+          CONSTRAINT uq_odds_quotes_unique UNIQUE (fixture_id, bookmaker_id, bet_id, selection, update_time)
+        ) PARTITION BY RANGE (update_time)
+        """
+    )
+    op.create_index("ix_odds_quotes_fixture", "odds_quotes", ["fixture_id"])
+    op.create_index("ix_odds_quotes_bookmaker_bet", "odds_quotes", ["bookmaker_id", "bet_id"])
+    op.execute("CREATE TABLE odds_quotes_default PARTITION OF odds_quotes DEFAULT")
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION ensure_odds_quotes_partition(month_start date)
+        RETURNS text AS $$
+        DECLARE
+          start_day date := date_trunc('month', month_start)::date;
+          part text := 'odds_quotes_p' || to_char(start_day, 'YYYYMM');
+        BEGIN
+          IF to_regclass(part) IS NULL THEN
+            EXECUTE 'CREATE TABLE ' || quote_ident(part) || ' PARTITION OF odds_quotes FOR VALUES FROM ('
+              || quote_literal(start_day::timestamp AT TIME ZONE 'UTC') || ') TO ('
+              || quote_literal((start_day + interval '1 month')::timestamp AT TIME ZONE 'UTC') || ')';
+          END IF;
+          RETURN part;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        SELECT ensure_odds_quotes_partition(m::date)
+        FROM generate_series(
+          date_trunc('month', COALESCE((SELECT min(COALESCE(update_time, created_at)) FROM odds_quotes_legacy), now()) AT TIME ZONE 'UTC'),
+          date_trunc('month', now() AT TIME ZONE 'UTC') + interval '2 month',
+          interval '1 month'
+        ) AS m
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO odds_quotes (fixture_id, bookmaker_id, bookmaker_name, bet_id, bet_name, selection, odd, update_time, created_at)
+        SELECT fixture_id, bookmaker_id, bookmaker_name, bet_id, bet_name, selection,
+               CASE WHEN odd ~ '^[0-9]+(\\.[0-9]+)?$' THEN odd::numeric END,
+               COALESCE(update_time, created_at, now()),
+               created_at
+        FROM odds_quotes_legacy
+        ON CONFLICT ON CONSTRAINT uq_odds_quotes_unique DO NOTHING
+        """
+    )
+    op.execute("DROP TABLE odds_quotes_legacy")
+
+
+def downgrade():
+    op.execute("ALTER TABLE odds_quotes RENAME TO odds_quotes_partitioned")
+    op.execute("ALTER TABLE odds_quotes_partitioned RENAME CONSTRAINT uq_odds_quotes_unique TO uq_odds_quotes_partitioned_unique")
+    op.execute("ALTER TABLE odds_quotes_partitioned RENAME CONSTRAINT odds_quotes_pkey TO odds_quotes_partitioned_pkey")
+    op.execute("ALTER INDEX ix_odds_quotes_fixture RENAME TO ix_odds_quotes_partitioned_fixture")
+    op.execute("ALTER INDEX ix_odds_quotes_bookmaker_bet RENAME TO ix_odds_quotes_partitioned_bookmaker_bet")
+    op.execute("ALTER SEQUENCE odds_quotes_id_seq RENAME TO odds_quotes_partitioned_id_seq")
+    op.create_table(
+        "odds_quotes",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("fixture_id", sa.Integer(), nullable=False),
+        sa.Column("bookmaker_id", sa.Integer()),
+        sa.Column("bookmaker_name", sa.String(length=255)),
+        sa.Column("bet_id", sa.Integer()),
+        sa.Column("bet_name", sa.String(length=255)),
+        sa.Column("selection", sa.String(length=255)),
+        sa.Column("odd", sa.String(length=20)),
+        sa.Column("update_time", sa.DateTime(timezone=True)),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_odds_quotes_fixture", "odds_quotes", ["fixture_id"])
+    op.create_index("ix_odds_quotes_bookmaker_bet", "odds_quotes", ["bookmaker_id", "bet_id"])
+    op.create_unique_constraint(
+        "uq_odds_quotes_unique",
+        "odds_quotes",
+        ["fixture_id", "bookmaker_id", "bet_id", "selection", "update_time"],
+    )
+    op.execute(
+        """
+        INSERT INTO odds_quotes (fixture_id, bookmaker_id, bookmaker_name, bet_id, bet_name, selection, odd, update_time, created_at)
+        SELECT fixture_id, bookmaker_id, bookmaker_name, bet_id, bet_name, selection, odd::text, update_time, created_at
+        FROM odds_quotes_partitioned
+        """
+    )
+    op.execute("DROP TABLE odds_quotes_partitioned CASCADE")
+    op.execute("DROP FUNCTION IF EXISTS ensure_odds_quotes_partition(date)")
@@ -0,0 +1,36 @@
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "odds_latest",
+        sa.Column("fixture_id", sa.Integer(), primary_key=True),
+        sa.Column("bookmaker_id", sa.Integer(), primary_key=True),
+        sa.Column("bet_id", sa.Integer(), primary_key=True),
+        sa.Column("selection", sa.String(length=255), primary_key=True),
+        sa.Column("bookmaker_name", sa.String(length=255)),
+        sa.Column("bet_name", sa.String(length=255)),
+        sa.Column("odd", sa.Numeric(10, 3)),
+        sa.Column("update_time", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("fetched_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.execute(
+        """
+        INSERT INTO odds_latest (fixture_id, bookmaker_id, bet_id, selection, bookmaker_name, bet_name, odd, update_time, fetched_at)
+        SELECT DISTINCT ON (fixture_id, bookmaker_id, bet_id, selection)
+               fixture_id, bookmaker_id, bet_id, selection, bookmaker_name, bet_name, odd, update_time, created_at
+        FROM odds_quotes
+        WHERE bookmaker_id IS NOT NULL AND bet_id IS NOT NULL AND selection IS NOT NULL
+        ORDER BY fixture_id, bookmaker_id, bet_id, selection, update_time DESC
+        """
+    )
+
+
+def downgrade():
+    op.drop_table("odds_latest")
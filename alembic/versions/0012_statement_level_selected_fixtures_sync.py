@@ -0,0 +1,115 @@
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+# 0013 的 downgrade 直接复用该定义，保证回滚后与本版本完全一致
+SYNC_FUNCTION_SQL = """
+        CREATE OR REPLACE FUNCTION sync_selected_fixtures_stmt()
+        RETURNS trigger AS $$
+        BEGIN
+          INSERT INTO selected_fixtures (
+              fixture_id, league_id, league_name, country_name, season, round,
+              match_date, status_short, status_long, venue_id, venue_name, venue_city,
+              home_team_id, home_team_name, away_team_id, away_team_name, goals_home, goals_away,
+              halftime_home, halftime_away, fulltime_home, fulltime_away, updated_at
+          )
+          SELECT
+              n.fixture_id, n.league_id, n.league_name, n.country_name, n.season, n.round,
+              n.match_date, n.status_short, n.status_long, n.venue_id, n.venue_name, n.venue_city,
+              n.home_team_id, n.home_team_name, n.away_team_id, n.away_team_name, n.goals_home, n.goals_away,
+              n.halftime_home, n.halftime_away, n.fulltime_home, n.fulltime_away, now()
+          FROM new_rows n
+          JOIN selected_leagues s ON s.league_id = n.league_id
+          ON CONFLICT (fixture_id) DO UPDATE SET
+              league_id = EXCLUDED.league_id,
+              league_name = EXCLUDED.league_name,
+              country_name = EXCLUDED.country_name,
+              season = EXCLUDED.season,
+              round = EXCLUDED.round,
+              match_date = EXCLUDED.match_date,
+              status_short = EXCLUDED.status_short,
+              status_long = EXCLUDED.status_long,
+              venue_id = EXCLUDED.venue_id,
+              venue_name = EXCLUDED.venue_name,
+              venue_city = EXCLUDED.venue_city,
+              home_team_id = EXCLUDED.home_team_id,
+              home_team_name = EXCLUDED.home_team_name,
+              away_team_id = EXCLUDED.away_team_id,
+              away_team_name = EXCLUDED.away_team_name,
+              goals_home = EXCLUDED.goals_home,
+              goals_away = EXCLUDED.goals_away,
+              halftime_home = EXCLUDED.halftime_home,
+              halftime_away = EXCLUDED.halftime_away,
+              fulltime_home = EXCLUDED.fulltime_home,
+              fulltime_away = EXCLUDED.fulltime_away,
+              updated_at = now()
+          WHERE (
+                selected_fixtures.league_id, selected_fixtures.league_name, selected_fixtures.country_name, selected_fixtures.season,
+                selected_fixtures.round, selected_fixtures.match_date, selected_fixtures.status_short, selected_fixtures.status_long,
+                selected_fixtures.venue_id, selected_fixtures.venue_name, selected_fixtures.venue_city, selected_fixtures.home_team_id,
+                selected_fixtures.home_team_name, selected_fixtures.away_team_id, selected_fixtures.away_team_name, selected_fixtures.goals_home,
+                selected_fixtures.goals_away, selected_fixtures.halftime_home, selected_fixtures.halftime_away, selected_fixtures.fulltime_home,
+                selected_fixtures.fulltime_away
+          ) IS DISTINCT FROM (
+                EXCLUDED.league_id, EXCLUDED.league_name, EXCLUDED.country_name, EXCLUDED.season,
+                EXCLUDED.round, EXCLUDED.match_date, EXCLUDED.status_short, EXCLUDED.status_long,
+                EXCLUDED.venue_id, EXCLUDED.venue_name, EXCLUDED.venue_city, EXCLUDED.home_team_id,
+                EXCLUDED.home_team_name, EXCLUDED.away_team_id, EXCLUDED.away_team_name, EXCLUDED.goals_home,
+                EXCLUDED.goals_away, EXCLUDED.halftime_home, EXCLUDED.halftime_away, EXCLUDED.fulltime_home,
+                EXCLUDED.fulltime_away
+          );
+          IF TG_OP = 'UPDATE' THEN
+            -- 只有联赛从已选变为未选的行才需要从 selected_fixtures 移除
+            DELETE FROM selected_fixtures sf
+            USING old_rows o
+            JOIN new_rows n ON n.fixture_id = o.fixture_id
+            WHERE sf.fixture_id = n.fixture_id
+              AND o.league_id IS DISTINCT FROM n.league_id
+              AND NOT EXISTS (SELECT 1 FROM selected_leagues s WHERE s.league_id = n.league_id);
+          END IF;
+          RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+
+
+def upgrade():
+    # 用语句级触发器 + 过渡表替换 0004 的行级触发器：
+    # 批量写入 fixtures 时每条语句只同步一次；内容未变化的行不更新；非已选联赛的行不再逐行执行 DELETE
+    op.execute("DROP TRIGGER IF EXISTS fixtures_sync_selected ON fixtures")
+    op.execute(SYNC_FUNCTION_SQL)
+    # 一个带过渡表的触发器只能对应一种事件，INSERT 和 UPDATE 各建一个
+    op.execute(
+        """
+        CREATE TRIGGER fixtures_sync_selected_insert
+        AFTER INSERT ON fixtures
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION sync_selected_fixtures_stmt();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER fixtures_sync_selected_update
+        AFTER UPDATE ON fixtures
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION sync_selected_fixtures_stmt();
+        """
+    )
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS fixtures_sync_selected_update ON fixtures")
+    op.execute("DROP TRIGGER IF EXISTS fixtures_sync_selected_insert ON fixtures")
+    op.execute("DROP FUNCTION IF EXISTS sync_selected_fixtures_stmt()")
+    # 0004 的 sync_selected_fixtures() 行级函数未被删除，直接恢复原触发器
+    op.execute(
+        """
+        CREATE TRIGGER fixtures_sync_selected
+        AFTER INSERT OR UPDATE ON fixtures
+        FOR EACH ROW EXECUTE FUNCTION sync_selected_fixtures();
+        """
+    )
@@ -0,0 +1,20 @@
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0014"
+down_revision = "0013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 未配置 Redis 时，赔率调度器用该表记录每场比赛上次入队的 ETA
+    op.create_table(
+        "odds_refresh_schedule",
+        sa.Column("fixture_id", sa.Integer(), primary_key=True),
+        sa.Column("scheduled_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("odds_refresh_schedule")
@@ -0,0 +1,16 @@
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0015"
+down_revision = "0014"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 每日联赛导入时顺带记录当前赛季，按联赛拉取比赛时不再单独请求 /leagues
+    op.add_column("leagues", sa.Column("current_season", sa.Integer(), nullable=True))
+
+
+def downgrade():
+    op.drop_column("leagues", "current_season")
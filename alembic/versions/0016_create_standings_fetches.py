@@ -0,0 +1,30 @@
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0016"
+down_revision = "0015"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 每个 (league_id, season) 最近一次拉取 /standings 的时间，包括没有积分榜的杯赛
+    op.create_table(
+        "standings_fetches",
+        sa.Column("league_id", sa.Integer(), primary_key=True),
+        sa.Column("season", sa.Integer(), primary_key=True),
+        sa.Column("fetched_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    # 迁移此前写在 standings 中的 team_id=0 联赛级标记
+    op.execute(
+        """
+        INSERT INTO standings_fetches (league_id, season, fetched_at)
+        SELECT league_id, season, COALESCE(updated_at, now()) FROM standings WHERE team_id = 0
+        ON CONFLICT DO NOTHING
+        """
+    )
+    op.execute("DELETE FROM standings WHERE team_id = 0")
+
+
+def downgrade():
+    op.drop_table("standings_fetches")
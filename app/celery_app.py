@@ -1,6 +1,8 @@
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_process_init
 from .settings import settings
+from .db import reset_pool_after_fork
 
 celery = Celery(
     "worker",
@@ -12,8 +14,16 @@ celery = Celery(
 celery.conf.update(
     task_track_started=True,
     broker_connection_retry_on_startup=True,
+    # LLM 评估单独走一个队列，由专用 worker 的 --concurrency 控制并发上限
+    task_routes={"tasks.ai_eval_fixture": {"queue": settings.AI_EVAL_QUEUE}},
 )
 
+
+@worker_process_init.connect
+def _reset_db_pool(**kwargs):
+    reset_pool_after_fork()
+
+
 celery.conf.beat_schedule = {
     "import-leagues-daily": {
         "task": "tasks.import_leagues",
@@ -24,11 +34,41 @@ celery.conf.beat_schedule = {
         "task": "tasks.fetch_recent_fixtures",
         "schedule": crontab(minute=0, hour="*/4"),
         "args": [7],
+        "kwargs": {"mode": settings.FIXTURES_FETCH_MODE},
+    }
+    ,
+    "refresh-selected-fixtures-10m": {
+        "task": "tasks.refresh_selected_fixtures",
+        "schedule": crontab(minute="*/10"),
+    }
+    ,
+    "poll-live-fixtures": {
+        "task": "tasks.poll_live_fixtures",
+        "schedule": settings.LIVE_POLL_SECONDS,
+        # 过期未执行的轮询直接丢弃，避免 worker 繁忙时积压
+        "options": {"expires": settings.LIVE_POLL_SECONDS},
     }
     ,
-    "fetch-odds-open-fixtures-hourly": {
+    "refresh-standings-3h": {
+        "task": "tasks.refresh_standings",
+        "schedule": crontab(minute=30, hour="*/3"),
+    }
+    ,
+    "schedule-odds-refresh": {
+        "task": "tasks.schedule_odds_refresh",
+        # 按秒计的固定间隔，任意分钟数都能得到均匀的调度周期（crontab 的 */N 只在 N 整除 60 时均匀）
+        "schedule": settings.ODDS_SCHEDULER_TICK_MINUTES * 60,
+    }
+    ,
+    "fetch-odds-open-fixtures-batch-6h": {
         "task": "tasks.fetch_odds_for_open_selected_fixtures",
-        "schedule": crontab(minute=0, hour="*"),
+        "schedule": crontab(minute=0, hour="*/6"),
+        "kwargs": {"mode": "batch"},
+    }
+    ,
+    "maintain-odds-quotes-daily": {
+        "task": "tasks.maintain_odds_quotes",
+        "schedule": crontab(minute=15, hour=2),
     }
     ,
     "ai-eval-upcoming-selected-fixtures-3h": {
@@ -1,13 +1,51 @@
-import psycopg2
 import json
+from contextlib import contextmanager
 from psycopg2.extras import RealDictCursor
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from .settings import settings
 
+engine = create_engine(
+    settings.POSTGRES_DSN,
+    pool_pre_ping=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    json_serializer=lambda o: json.dumps(o, ensure_ascii=False),
+    json_deserializer=lambda s: json.loads(s),
+)
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
 
+@contextmanager
 def get_conn():
-    return psycopg2.connect(settings.POSTGRES_DSN)
+    # 从 engine 的连接池借出原生 psycopg2 连接，退出时提交/回滚并归还连接池
+    conn = engine.raw_connection()
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def reset_pool_after_fork():
+    # prefork 子进程不能复用父进程的 socket，丢弃继承来的连接但不关闭它们
+    engine.dispose(close=False)
+
+
+def db_pool_stats():
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+    }
 
 
 def init_db():
@@ -50,16 +88,44 @@ def fetch_result(celery_task_id: str):
             )
             return cur.fetchone()
 
-engine = create_engine(
-    settings.POSTGRES_DSN,
-    pool_pre_ping=True,
-    json_serializer=lambda o: json.dumps(o, ensure_ascii=False),
-    json_deserializer=lambda s: json.loads(s),
+
+FIXTURE_SYNC_COLUMNS = (
+    "fixture_id", "league_id", "league_name", "country_name", "season", "round",
+    "match_date", "status_short", "status_long", "status_elapsed", "venue_id", "venue_name", "venue_city",
+    "home_team_id", "home_team_name", "away_team_id", "away_team_name",
+    "goals_home", "goals_away", "halftime_home", "halftime_away", "fulltime_home", "fulltime_away",
 )
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
 
-def sync_selected_leagues():
+def _reconcile_selected_fixtures(cur):
+    # 集合操作一次性对齐 selected_fixtures 与 selected_leagues：移除未选联赛的比赛，补齐新选联赛已入库的比赛
+    cur.execute(
+        """
+        DELETE FROM selected_fixtures sf
+        WHERE NOT EXISTS (SELECT 1 FROM selected_leagues s WHERE s.league_id = sf.league_id)
+        """
+    )
+    removed = cur.rowcount
+    cols = ", ".join(FIXTURE_SYNC_COLUMNS)
+    cur.execute(
+        f"""
+        INSERT INTO selected_fixtures ({cols}, updated_at)
+        SELECT {", ".join("f." + c for c in FIXTURE_SYNC_COLUMNS)}, now()
+        FROM fixtures f
+        JOIN selected_leagues s ON s.league_id = f.league_id
+        ON CONFLICT (fixture_id) DO NOTHING
+        """
+    )
+    return {"removed": removed, "added": cur.rowcount}
+
+
+def reconcile_selected_fixtures():
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            return _reconcile_selected_fixtures(cur)
+
+
+def selected_league_ids():
     raw = getattr(settings, "LEAGUE_IDS", "")
     ids = []
     for s in raw.split(","):
@@ -69,11 +135,24 @@ def sync_selected_leagues():
                 ids.append(int(s))
             except Exception:
                 pass
+    return ids
+
+
+def sync_selected_leagues():
+    ids = selected_league_ids()
+    out = {"leagues_added": 0, "leagues_removed": 0}
     with get_conn() as conn:
         with conn.cursor() as cur:
             cur.execute("CREATE TABLE IF NOT EXISTS selected_leagues (league_id INT PRIMARY KEY)")
             if ids:
-                cur.execute("DELETE FROM selected_leagues WHERE league_id NOT IN (%s)" % ",".join(["%s"] * len(ids)), ids)
-                for i in ids:
-                    cur.execute("INSERT INTO selected_leagues (league_id) VALUES (%s) ON CONFLICT (league_id) DO NOTHING", (i,))
-            conn.commit()
+                cur.execute("DELETE FROM selected_leagues WHERE NOT (league_id = ANY(%s))", (ids,))
+                out["leagues_removed"] = cur.rowcount
+                cur.execute(
+                    "INSERT INTO selected_leagues (league_id) SELECT unnest(%s::int[]) ON CONFLICT (league_id) DO NOTHING",
+                    (ids,),
+                )
+                out["leagues_added"] = cur.rowcount
+                # 联赛集合变化时才回填/清理 selected_fixtures，不依赖触发器等到下次更新
+                if out["leagues_added"] or out["leagues_removed"]:
+                    out["fixtures"] = _reconcile_selected_fixtures(cur)
+    return out
@@ -1,13 +1,19 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from pathlib import Path
 from alembic import command
 from alembic.config import Config
 from .settings import settings
-from .db import init_db, fetch_result, sync_selected_leagues
+from .db import init_db, fetch_result, sync_selected_leagues, reconcile_selected_fixtures, db_pool_stats
+from data_fetcher.odds import get_latest_odds
+from data_fetcher.payload_fingerprint import fingerprint_stats
+from data_fetcher.ratelimit import limiter_state
+from agent.tool_cache import cache_stats
 from .tasks import (
     add,
     fetch_fixtures_for_date,
     fetch_recent_fixtures,
+    refresh_selected_fixtures,
+    poll_live_fixtures,
     fetch_odds_for_fixture,
     fetch_odds_for_open_selected_fixtures,
 )
@@ -28,6 +34,26 @@ def health():
     return {"status": "ok"}
 
 
+@app.get("/health/db-pool")
+def health_db_pool():
+    return db_pool_stats()
+
+
+@app.get("/health/ratelimit")
+def health_ratelimit():
+    return limiter_state()
+
+
+@app.get("/health/payload-fingerprints")
+def health_payload_fingerprints():
+    return fingerprint_stats()
+
+
+@app.get("/health/tool-cache")
+def health_tool_cache():
+    return cache_stats()
+
+
 @app.post("/tasks/add")
 def create_add_task(x: int, y: int):
     task = add.delay(x, y)
@@ -49,9 +75,27 @@ def trigger_fetch_fixtures_for_date(day: str):
 
 
 @app.post("/tasks/fixtures/recent")
-def trigger_fetch_recent_fixtures(days: int = 7):
-    t = fetch_recent_fixtures.delay(days)
-    return {"celery_task_id": t.id, "task": "tasks.fetch_recent_fixtures", "days": days}
+def trigger_fetch_recent_fixtures(days: int = 7, mode: str = "global"):
+    t = fetch_recent_fixtures.delay(days, mode)
+    return {"celery_task_id": t.id, "task": "tasks.fetch_recent_fixtures", "days": days, "mode": mode}
+
+
+@app.post("/tasks/fixtures/selected/refresh")
+def trigger_refresh_selected_fixtures(hours_ahead: int = 24, hours_back: int = 4):
+    t = refresh_selected_fixtures.delay(hours_ahead, hours_back)
+    return {"celery_task_id": t.id, "task": "tasks.refresh_selected_fixtures", "hours_ahead": hours_ahead, "hours_back": hours_back}
+
+
+@app.post("/fixtures/selected/reconcile")
+def trigger_reconcile_selected_fixtures():
+    # 手动对齐 selected_fixtures 与 selected_leagues（两条集合 SQL，直接同步执行）
+    return reconcile_selected_fixtures()
+
+
+@app.post("/tasks/fixtures/live/poll")
+def trigger_poll_live_fixtures(window_hours: int = 3):
+    t = poll_live_fixtures.delay(window_hours)
+    return {"celery_task_id": t.id, "task": "tasks.poll_live_fixtures", "window_hours": window_hours}
 
 
 @app.post("/tasks/odds/fixture/{fixture_id}")
@@ -61,6 +105,25 @@ def trigger_fetch_odds_for_fixture(fixture_id: int):
 
 
 @app.post("/tasks/odds/open-selected")
-def trigger_fetch_odds_for_open_selected_fixtures():
-    t = fetch_odds_for_open_selected_fixtures.delay()
-    return {"celery_task_id": t.id, "task": "tasks.fetch_odds_for_open_selected_fixtures"}
+def trigger_fetch_odds_for_open_selected_fixtures(mode: str = "fixture"):
+    t = fetch_odds_for_open_selected_fixtures.delay(mode)
+    return {"celery_task_id": t.id, "task": "tasks.fetch_odds_for_open_selected_fixtures", "mode": mode}
+
+
+@app.get("/odds/latest")
+def latest_odds(fixture_ids: str = Query(..., description="逗号分隔的 fixture_id"), bet_id: int | None = None):
+    try:
+        ids = [int(s) for s in fixture_ids.split(",") if s.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="fixture_ids 必须是逗号分隔的整数")
+    if not ids:
+        raise HTTPException(status_code=400, detail="fixture_ids 不能为空")
+    if len(ids) > 200:
+        raise HTTPException(status_code=400, detail="一次最多查询 200 场比赛")
+    return {"odds": get_latest_odds(ids, bet_id)}
+
+
+@app.get("/odds/latest/{fixture_id}")
+def latest_odds_for_fixture(fixture_id: int, bet_id: int | None = None):
+    quotes = get_latest_odds([fixture_id], bet_id)[fixture_id]
+    return {"fixture_id": fixture_id, "quotes": quotes}
@@ -1,5 +1,6 @@
 from datetime import datetime
-from sqlalchemy import Integer, String, Text, DateTime, Numeric, JSON
+from decimal import Decimal
+from sqlalchemy import BigInteger, Integer, String, Text, DateTime, Numeric, JSON, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
@@ -18,6 +19,7 @@ class League(Base):
     country_name: Mapped[str | None] = mapped_column(String(100))
     country_code: Mapped[str | None] = mapped_column(String(10))
     country_flag_url: Mapped[str | None] = mapped_column(Text)
+    current_season: Mapped[int | None] = mapped_column(Integer)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
 
@@ -37,6 +39,7 @@ class Fixture(Base):
     match_date: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     status_short: Mapped[str | None] = mapped_column(String(10))
     status_long: Mapped[str | None] = mapped_column(String(100))
+    status_elapsed: Mapped[int | None] = mapped_column(Integer)
 
     # venue
     venue_id: Mapped[int | None] = mapped_column(Integer)
@@ -75,6 +78,7 @@ class SelectedFixture(Base):
     match_date: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     status_short: Mapped[str | None] = mapped_column(String(10))
     status_long: Mapped[str | None] = mapped_column(String(100))
+    status_elapsed: Mapped[int | None] = mapped_column(Integer)
 
     venue_id: Mapped[int | None] = mapped_column(Integer)
     venue_name: Mapped[str | None] = mapped_column(String(255))
@@ -104,19 +108,63 @@ class AiEval(Base):
     fixture_id: Mapped[int] = mapped_column(Integer, nullable=False)
     strategy: Mapped[str | None] = mapped_column(String(50))
     content: Mapped[dict] = mapped_column(JSON, nullable=False)
+    input_fingerprint: Mapped[str | None] = mapped_column(String(64))
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
 
 class OddsQuote(Base):
+    # 按 update_time 月分区（见迁移 0010），主键必须包含分区键
     __tablename__ = "odds_quotes"
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
     fixture_id: Mapped[int] = mapped_column(Integer, nullable=False)
     bookmaker_id: Mapped[int | None] = mapped_column(Integer)
     bookmaker_name: Mapped[str | None] = mapped_column(String(255))
     bet_id: Mapped[int | None] = mapped_column(Integer)
     bet_name: Mapped[str | None] = mapped_column(String(255))
     selection: Mapped[str | None] = mapped_column(String(255))
-    odd: Mapped[str | None] = mapped_column(String(20))
-    update_time: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    odd: Mapped[Decimal | None] = mapped_column(Numeric(10, 3))
+    update_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+class Standing(Base):
+    __tablename__ = "standings"
+    __table_args__ = (UniqueConstraint("league_id", "season", "team_id", name="uq_standings_league_season_team"),)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    league_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    season: Mapped[int] = mapped_column(Integer, nullable=False)
+    team_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    rank: Mapped[int | None] = mapped_column(Integer)
+    points: Mapped[int | None] = mapped_column(Integer)
+    data: Mapped[dict] = mapped_column(JSON, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class StandingsFetch(Base):
+    # 每个联赛赛季最近一次拉取积分榜的时间，没有积分榜的杯赛也会记录，避免重复请求
+    __tablename__ = "standings_fetches"
+    league_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    season: Mapped[int] = mapped_column(Integer, primary_key=True)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class OddsLatest(Base):
+    # 每个 (fixture, bookmaker, bet, selection) 的最新报价，由赔率写入路径在同一事务内维护
+    __tablename__ = "odds_latest"
+    fixture_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    bookmaker_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    bet_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    selection: Mapped[str] = mapped_column(String(255), primary_key=True)
+    bookmaker_name: Mapped[str | None] = mapped_column(String(255))
+    bet_name: Mapped[str | None] = mapped_column(String(255))
+    odd: Mapped[Decimal | None] = mapped_column(Numeric(10, 3))
+    update_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+class OddsRefreshSchedule(Base):
+    # 赔率调度器上次为每场比赛入队的 ETA（Redis 不可用时的回退存储）
+    __tablename__ = "odds_refresh_schedule"
+    fixture_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    scheduled_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
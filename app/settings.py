@@ -11,11 +11,22 @@ class Settings(BaseSettings):
     CELERY_RESULT_BACKEND: str
 
     POSTGRES_DSN: str
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 5
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
 
     API_FOOTBALL_KEY: str
     LEAGUE_IDS: str
     BETS_IDS: str
     LARK_WARN_BOT_URL: str
 
+    AI_EVAL_QUEUE: str = "ai_eval"
+    FIXTURES_FETCH_MODE: str = "global"
+    # 赔率刷新档位："距开赛小时数:刷新间隔分钟"，按距开赛时间从远到近匹配第一个满足 > 小时数 的档位
+    ODDS_REFRESH_TIERS: str = "168:1440,48:360,2:60,0:5"
+    ODDS_SCHEDULER_TICK_MINUTES: int = 5
+    LIVE_POLL_SECONDS: int = 30
+
 
 settings = Settings()
@@ -1,17 +1,21 @@
+import os
 import json
 from datetime import datetime, timezone
+import redis
 import requests
 from pathlib import Path
-from sqlalchemy import select
+from sqlalchemy import select, func as sa_func
+from sqlalchemy.dialects.postgresql import insert
+from celery import chord
 from .celery_app import celery
-from .db import save_result, SessionLocal
-from .notify import notify_lark_result, notify_lark_error
-from .models import League, Fixture, SelectedFixture, OddsQuote, AiEval
+from .db import save_result, SessionLocal, selected_league_ids
+from .notify import notify_lark_result, notify_lark_error, notify_lark_text
+from .models import League, Fixture, SelectedFixture, OddsQuote, OddsLatest, OddsRefreshSchedule, AiEval
 from data_fetcher.leagues import import_leagues_data
-from data_fetcher.fixtures import fetch_fixtures_for_date_data
-from data_fetcher.odds import fetch_odds_for_fixture_data
-from langchain_core.messages import HumanMessage
-from agent.match_fundamentals_analyst import graph
+from data_fetcher.fixtures import fetch_fixtures_for_date_data, fetch_fixtures_by_ids_data, fetch_fixtures_for_league_data, fetch_live_fixtures_data, FINISHED_STATUSES, LIVE_STATUSES
+from data_fetcher.standings import fetch_standings_data
+from data_fetcher.redis_client import get_redis
+from data_fetcher.odds import fetch_odds_for_fixture_data, fetch_odds_for_league_data, ensure_odds_partitions, compact_old_odds_partitions, odds_refresh_tiers, odds_refresh_interval
 
 
 @celery.task(name="tasks.add")
@@ -49,44 +53,167 @@ def fetch_fixtures_for_date(day: str):
         raise
 
 
+@celery.task(name="tasks.fetch_fixtures_for_league")
+def fetch_fixtures_for_league(league_id: int, date_from: str, date_to: str):
+    try:
+        res = fetch_fixtures_for_league_data(league_id, date_from, date_to)
+        req_id = getattr(fetch_fixtures_for_league.request, "id", None) or f"fixtures-league-{league_id}"
+        out = {"from": date_from, "to": date_to, **res}
+        save_result(celery_task_id=req_id, result=json.dumps(out))
+        return out
+    except Exception as e:
+        notify_lark_error("tasks.fetch_fixtures_for_league", e)
+        raise
+
+
 @celery.task(name="tasks.fetch_recent_fixtures")
-def fetch_recent_fixtures(days: int = 7):
+def fetch_recent_fixtures(days: int = 7, mode: str = "global"):
+    # mode=global: 按天拉取全球所有比赛；mode=scoped: 只按 LEAGUE_IDS 中的联赛拉取日期区间
     from datetime import datetime, timedelta, timezone
     today = datetime.now(timezone.utc).date()
     scheduled = []
-    for i in range(days):
-        day = (today - timedelta(days=i)).isoformat()
-        t = fetch_fixtures_for_date.delay(day)
-        scheduled.append({"day": day, "task_id": t.id})
+    if mode == "scoped":
+        date_from = (today - timedelta(days=days - 1)).isoformat()
+        date_to = today.isoformat()
+        for league_id in selected_league_ids():
+            t = fetch_fixtures_for_league.delay(league_id, date_from, date_to)
+            scheduled.append({"league_id": league_id, "from": date_from, "to": date_to, "task_id": t.id})
+    else:
+        for i in range(days):
+            day = (today - timedelta(days=i)).isoformat()
+            t = fetch_fixtures_for_date.delay(day)
+            scheduled.append({"day": day, "task_id": t.id})
     req_id = getattr(fetch_recent_fixtures.request, "id", None) or "fixtures-7days"
-    out = {"scheduled": scheduled}
+    out = {"mode": mode, "scheduled": scheduled}
     save_result(celery_task_id=req_id, result=json.dumps(out))
     notify_lark_result("tasks.fetch_recent_fixtures", out)
     return out
 
 
+@celery.task(name="tasks.refresh_selected_fixtures")
+def refresh_selected_fixtures(hours_ahead: int = 24, hours_back: int = 4):
+    # 只刷新临近开赛/进行中且未结束的已选比赛，由触发器同步到 selected_fixtures
+    from datetime import timedelta
+    try:
+        now_utc = datetime.now(timezone.utc)
+        with SessionLocal() as session:
+            ids = session.execute(
+                select(SelectedFixture.fixture_id).where(
+                    (SelectedFixture.match_date >= now_utc - timedelta(hours=hours_back))
+                    & (SelectedFixture.match_date <= now_utc + timedelta(hours=hours_ahead))
+                    & (SelectedFixture.status_short.is_(None) | SelectedFixture.status_short.not_in(FINISHED_STATUSES))
+                )
+            ).scalars().all()
+        res = fetch_fixtures_by_ids_data([int(i) for i in ids]) if ids else {"requested": 0, "received": 0, "created": 0, "updated": 0}
+        req_id = getattr(refresh_selected_fixtures.request, "id", None) or "refresh-selected-fixtures"
+        save_result(celery_task_id=req_id, result=json.dumps(res))
+        return res
+    except Exception as e:
+        notify_lark_error("tasks.refresh_selected_fixtures", e)
+        raise
+
+
+@celery.task(name="tasks.poll_live_fixtures")
+def poll_live_fixtures(window_hours: int = 3):
+    # 只有已选比赛处于进行中（或已开赛但尚未结束）时才请求 /fixtures?live=，否则直接跳过不消耗 API 配额
+    from datetime import timedelta
+    try:
+        now_utc = datetime.now(timezone.utc)
+        with SessionLocal() as session:
+            live = session.execute(
+                select(SelectedFixture.fixture_id, SelectedFixture.league_id).where(
+                    SelectedFixture.status_short.in_(LIVE_STATUSES)
+                    | (
+                        (SelectedFixture.match_date <= now_utc)
+                        & (SelectedFixture.match_date >= now_utc - timedelta(hours=window_hours))
+                        & (SelectedFixture.status_short.is_(None) | SelectedFixture.status_short.not_in(FINISHED_STATUSES))
+                    )
+                )
+            ).all()
+        if not live:
+            return {"skipped": True, "live": 0}
+        res = fetch_live_fixtures_data([int(league_id) for _, league_id in live if league_id is not None])
+        # 刚结束的比赛会从 live 列表中消失，按 id 补拉一次拿到最终比分与状态
+        with SessionLocal() as session:
+            still_live = set(session.execute(
+                select(SelectedFixture.fixture_id).where(
+                    SelectedFixture.fixture_id.in_([int(fid) for fid, _ in live])
+                    & SelectedFixture.status_short.in_(LIVE_STATUSES)
+                )
+            ).scalars().all())
+        dropped = sorted(still_live - set(res.pop("fixture_ids")))
+        res["finalized"] = fetch_fixtures_by_ids_data(dropped)["updated"] if dropped else 0
+        res["live"] = len(live)
+        req_id = getattr(poll_live_fixtures.request, "id", None) or "poll-live-fixtures"
+        save_result(celery_task_id=req_id, result=json.dumps(res))
+        return res
+    except Exception as e:
+        notify_lark_error("tasks.poll_live_fixtures", e)
+        raise
+
+
+@celery.task(name="tasks.refresh_standings")
+def refresh_standings(days_back: int = 2, days_ahead: int = 7):
+    # 刷新近期有已选比赛（刚结束或即将开赛）的联赛积分榜
+    from datetime import timedelta
+    from .settings import settings
+    try:
+        now_utc = datetime.now(timezone.utc)
+        with SessionLocal() as session:
+            pairs = session.execute(
+                select(SelectedFixture.league_id, SelectedFixture.season).where(
+                    (SelectedFixture.match_date >= now_utc - timedelta(days=days_back))
+                    & (SelectedFixture.match_date <= now_utc + timedelta(days=days_ahead))
+                    & SelectedFixture.league_id.is_not(None)
+                    & SelectedFixture.season.is_not(None)
+                ).distinct()
+            ).all()
+        refreshed = []
+        failed = []
+        # 单个联赛失败不影响其余联赛，失败项汇总后统一告警
+        for league_id, season in pairs:
+            try:
+                refreshed.append(fetch_standings_data(int(league_id), int(season)))
+            except Exception as e:
+                failed.append({"league_id": int(league_id), "season": int(season), "error": f"{type(e).__name__}: {e}"})
+        req_id = getattr(refresh_standings.request, "id", None) or "refresh-standings"
+        out = {"refreshed": refreshed, "failed": failed}
+        save_result(celery_task_id=req_id, result=json.dumps(out))
+        if failed:
+            notify_lark_text(f"[{settings.APP_NAME}] tasks.refresh_standings partial failure: {json.dumps(failed, ensure_ascii=False)[:1800]}")
+        return out
+    except Exception as e:
+        notify_lark_error("tasks.refresh_standings", e)
+        raise
+
+
+def _parse_bet_ids():
+    from .settings import settings
+    bets_raw = getattr(settings, "BETS_IDS", "")
+    bet_ids = set()
+    for s in bets_raw.split(","):
+        s = s.strip()
+        if s:
+            try:
+                bet_ids.add(int(s))
+            except Exception:
+                pass
+    return bet_ids
+
+
 @celery.task(name="tasks.fetch_odds_for_fixture")
 def fetch_odds_for_fixture(fixture_id: int):
-    from .settings import settings
     with SessionLocal() as session:
         sf = session.execute(select(SelectedFixture).where(SelectedFixture.fixture_id == fixture_id)).scalar_one_or_none()
         now_utc = datetime.now(timezone.utc)
-        if (not sf) or ((sf.status_long or "") == "Match Finished") or (sf.match_date is None) or (sf.match_date <= now_utc):
-            req_id = getattr(fetch_odds_for_fixture.request, "id", None) or f"odds-{fixture_id}"
+        skip = (not sf) or ((sf.status_long or "") == "Match Finished") or (sf.match_date is None) or (sf.match_date <= now_utc)
+    if skip:
+        req_id = getattr(fetch_odds_for_fixture.request, "id", None) or f"odds-{fixture_id}"
         out_skip = {"fixture_id": fixture_id, "skipped": True}
         save_result(celery_task_id=req_id, result=json.dumps(out_skip))
-        return {"fixture_id": fixture_id, "skipped": True}
+        return out_skip
     try:
-        bets_raw = getattr(settings, "BETS_IDS", "")
-        bet_ids = set()
-        for s in bets_raw.split(","):
-            s = s.strip()
-            if s:
-                try:
-                    bet_ids.add(int(s))
-                except Exception:
-                    pass
-        res = fetch_odds_for_fixture_data(fixture_id, bet_ids)
+        res = fetch_odds_for_fixture_data(fixture_id, _parse_bet_ids())
         req_id = getattr(fetch_odds_for_fixture.request, "id", None) or f"odds-{fixture_id}"
         out = {"fixture_id": fixture_id, **res}
         save_result(celery_task_id=req_id, result=json.dumps(out))
@@ -96,75 +223,264 @@ def fetch_odds_for_fixture(fixture_id: int):
         raise
 
 
+@celery.task(name="tasks.fetch_odds_for_league")
+def fetch_odds_for_league(league_id: int, season: int, fixture_ids: list[int]):
+    try:
+        res = fetch_odds_for_league_data(league_id, season, _parse_bet_ids(), set(fixture_ids))
+        req_id = getattr(fetch_odds_for_league.request, "id", None) or f"odds-league-{league_id}-{season}"
+        out = {"league_id": league_id, "season": season, **res}
+        save_result(celery_task_id=req_id, result=json.dumps(out))
+        return out
+    except Exception as e:
+        notify_lark_error("tasks.fetch_odds_for_league", e)
+        raise
+
+
 @celery.task(name="tasks.fetch_odds_for_open_selected_fixtures")
-def fetch_odds_for_open_selected_fixtures():
+def fetch_odds_for_open_selected_fixtures(mode: str = "fixture"):
+    # mode=fixture: 每场比赛一个 /odds?fixture= 请求；mode=batch: 每个联赛+赛季分页拉取一次
     scheduled = []
     with SessionLocal() as session:
         now_utc = datetime.now(timezone.utc)
         rows = session.execute(
-            select(SelectedFixture.fixture_id).where(
+            select(SelectedFixture.fixture_id, SelectedFixture.league_id, SelectedFixture.season).where(
                 ((SelectedFixture.status_long != "Match Finished") | (SelectedFixture.status_long.is_(None)))
                 & (SelectedFixture.match_date > now_utc)
             )
-        ).scalars().all()
-        for fid in rows:
+        ).all()
+    if mode == "batch":
+        groups = {}
+        for fid, league_id, season in rows:
+            if league_id is None or season is None:
+                continue
+            groups.setdefault((int(league_id), int(season)), []).append(int(fid))
+        for (league_id, season), fids in groups.items():
+            t = fetch_odds_for_league.delay(league_id, season, fids)
+            scheduled.append({"league_id": league_id, "season": season, "fixtures": len(fids), "task_id": t.id})
+    else:
+        for fid, _, _ in rows:
             t = fetch_odds_for_fixture.delay(int(fid))
             scheduled.append({"fixture_id": int(fid), "task_id": t.id})
     req_id = getattr(fetch_odds_for_open_selected_fixtures.request, "id", None) or "odds-open-fixtures"
-    out = {"scheduled": scheduled}
+    out = {"mode": mode, "scheduled": scheduled}
+    save_result(celery_task_id=req_id, result=json.dumps(out))
+    return out
+
+
+ODDS_SCHEDULE_MARKER_TTL_SECONDS = 8 * 24 * 3600
+
+
+def _load_odds_schedule_markers(fixture_ids: list[int]):
+    # 优先读 Redis；未配置或不可用时读 odds_refresh_schedule 表
+    if not fixture_ids:
+        return {}
+    r = get_redis()
+    if r is not None:
+        try:
+            values = r.mget([f"odds:scheduled:{fid}" for fid in fixture_ids])
+            return {fid: datetime.fromtimestamp(float(v), tz=timezone.utc) for fid, v in zip(fixture_ids, values) if v is not None}
+        except redis.RedisError:
+            pass
+    with SessionLocal() as session:
+        return dict(session.execute(
+            select(OddsRefreshSchedule.fixture_id, OddsRefreshSchedule.scheduled_at)
+            .where(OddsRefreshSchedule.fixture_id.in_(fixture_ids))
+        ).all())
+
+
+def _save_odds_schedule_markers(markers: dict):
+    if not markers:
+        return
+    r = get_redis()
+    if r is not None:
+        try:
+            pipe = r.pipeline()
+            for fid, eta in markers.items():
+                pipe.set(f"odds:scheduled:{fid}", eta.timestamp(), ex=ODDS_SCHEDULE_MARKER_TTL_SECONDS)
+            pipe.execute()
+            return
+        except redis.RedisError:
+            pass
+    from datetime import timedelta
+    stmt = insert(OddsRefreshSchedule).values([{"fixture_id": fid, "scheduled_at": eta} for fid, eta in markers.items()])
+    stmt = stmt.on_conflict_do_update(index_elements=["fixture_id"], set_={"scheduled_at": stmt.excluded.scheduled_at})
+    with SessionLocal() as session:
+        session.execute(stmt)
+        # 与 Redis 键的过期时间一致，清理早已过期的记录
+        session.execute(
+            OddsRefreshSchedule.__table__.delete().where(
+                OddsRefreshSchedule.scheduled_at < datetime.now(timezone.utc) - timedelta(seconds=ODDS_SCHEDULE_MARKER_TTL_SECONDS)
+            )
+        )
+        session.commit()
+
+
+@celery.task(name="tasks.schedule_odds_refresh")
+def schedule_odds_refresh():
+    # 按距开赛时间为每场比赛计算刷新间隔，把下一个调度周期内到期的比赛带 ETA 入队
+    from datetime import timedelta
+    from .settings import settings
+    now_utc = datetime.now(timezone.utc)
+    tick = timedelta(minutes=settings.ODDS_SCHEDULER_TICK_MINUTES)
+    tiers = odds_refresh_tiers()
+    with SessionLocal() as session:
+        rows = session.execute(
+            select(SelectedFixture.fixture_id, SelectedFixture.match_date).where(
+                ((SelectedFixture.status_long != "Match Finished") | (SelectedFixture.status_long.is_(None)))
+                & (SelectedFixture.match_date > now_utc)
+            )
+        ).all()
+        fetched = dict(session.execute(
+            select(OddsLatest.fixture_id, sa_func.max(OddsLatest.fetched_at))
+            .where(OddsLatest.fixture_id.in_([int(fid) for fid, _ in rows]))
+            .group_by(OddsLatest.fixture_id)
+        ).all()) if rows else {}
+    # 记录每场比赛上次入队的时间，避免同一场比赛在两次调度之间被重复入队
+    scheduled_at = _load_odds_schedule_markers([int(fid) for fid, _ in rows])
+    scheduled = []
+    markers = {}
+    for fid, match_date in rows:
+        fid = int(fid)
+        interval = odds_refresh_interval(match_date - now_utc, tiers)
+        last = fetched.get(fid)
+        if fid in scheduled_at:
+            last = max(last, scheduled_at[fid]) if last else scheduled_at[fid]
+        due = (last + interval) if last else now_utc
+        if due > now_utc + tick:
+            continue
+        eta = max(due, now_utc)
+        t = fetch_odds_for_fixture.apply_async((fid,), eta=eta)
+        markers[fid] = eta
+        scheduled.append({"fixture_id": fid, "eta": eta.isoformat(), "interval_minutes": int(interval.total_seconds() // 60), "task_id": t.id})
+    _save_odds_schedule_markers(markers)
+    req_id = getattr(schedule_odds_refresh.request, "id", None) or "schedule-odds-refresh"
+    out = {"open_fixtures": len(rows), "scheduled": scheduled}
+    save_result(celery_task_id=req_id, result=json.dumps(out))
+    return out
+
+
+@celery.task(name="tasks.maintain_odds_quotes")
+def maintain_odds_quotes():
+    try:
+        out = {"partitions": ensure_odds_partitions(), "compacted": compact_old_odds_partitions()}
+        req_id = getattr(maintain_odds_quotes.request, "id", None) or "maintain-odds-quotes"
+        save_result(celery_task_id=req_id, result=json.dumps(out))
+        notify_lark_result("tasks.maintain_odds_quotes", out)
+        return out
+    except Exception as e:
+        notify_lark_error("tasks.maintain_odds_quotes", e)
+        raise
+
+
+def _load_agent():
+    # LangChain/LangGraph、LLM 客户端和图的编译只在真正执行 AI 评估的进程里按需加载
+    from langchain_core.messages import HumanMessage
+    from agent.match_fundamentals_analyst import graph
+    return graph, HumanMessage
+
+
+@celery.task(name="tasks.ai_eval_fixture")
+def ai_eval_fixture(fixture_id: int, strategy: str = "fundamentals"):
+    from sqlalchemy.sql import func
+    from agent.api_football_tools import prefetch_fixture_inputs
+    from agent.fingerprint import input_fingerprint, incomplete_inputs
+    fixture_id = int(fixture_id)
+    try:
+        # 先做廉价的输入预检：重新获取工具数据并计算指纹，未变化则跳过 LLM
+        inputs = prefetch_fixture_inputs(fixture_id)
+        failed = incomplete_inputs(inputs)
+        if failed:
+            # 数据源临时故障时不评估、不改指纹，保留上一次的评估结果，下次调度再重试
+            return {"fixture_id": fixture_id, "evaluated": False, "skipped": True, "incomplete": failed}
+        fingerprint = input_fingerprint(inputs)
+        with SessionLocal() as session:
+            existing = session.execute(
+                select(AiEval).where((AiEval.fixture_id == fixture_id) & (AiEval.strategy == strategy))
+            ).scalar_one_or_none()
+            if existing is not None and existing.input_fingerprint in (None, fingerprint):
+                # 旧记录没有指纹时只补写指纹，之后输入变化才会重新评估
+                if existing.input_fingerprint is None:
+                    existing.input_fingerprint = fingerprint
+                    session.commit()
+                return {"fixture_id": fixture_id, "evaluated": False, "unchanged": True}
+        graph, HumanMessage = _load_agent()
+        initial_state = {
+            "messages": [HumanMessage(content=f"分析比赛id为 {fixture_id} 的基本面数据")],
+            "fixture_id": fixture_id,
+            "sender": "user",
+            "fundamentals_report": "",
+            "strategy": strategy,
+            "prefetched": inputs,
+        }
+        result = graph.invoke(initial_state)
+        translations = result.get("translations") or {}
+        with SessionLocal() as session:
+            stmt = insert(AiEval).values(
+                fixture_id=fixture_id, strategy=strategy, content=translations, input_fingerprint=fingerprint,
+            )
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_ai_eval_fixture_strategy",
+                set_={"content": stmt.excluded.content, "input_fingerprint": stmt.excluded.input_fingerprint, "updated_at": func.now()},
+            )
+            session.execute(stmt)
+            session.commit()
+        return {
+            "fixture_id": fixture_id,
+            "evaluated": True,
+            "reevaluated": existing is not None,
+            "prompt_tokens": int(result.get("prompt_tokens") or 0),
+        }
+    except Exception as e:
+        # 单场失败不影响 chord 汇总
+        notify_lark_error("tasks.ai_eval_fixture", e)
+        return {"fixture_id": fixture_id, "evaluated": False, "error": f"{type(e).__name__}: {e}"}
+
+
+@celery.task(name="tasks.ai_eval_summary")
+def ai_eval_summary(results: list[dict], strategy: str = "fundamentals", dispatch_id: str | None = None):
+    results = [r for r in results or [] if r]
+    count = sum(1 for r in results if r.get("evaluated"))
+    out = {
+        "evaluated": count,
+        "reevaluated": sum(1 for r in results if r.get("reevaluated")),
+        "unchanged": sum(1 for r in results if r.get("unchanged")),
+        "skipped_incomplete": sum(1 for r in results if r.get("skipped")),
+        "dispatched": len(results),
+        "strategy": strategy,
+    }
+    # 用于对比不同工具输出编码（TOOL_OUTPUT_FORMAT）下每场评估的 prompt token
+    tokens = [int(r.get("prompt_tokens") or 0) for r in results if r.get("evaluated")]
+    out["prompt_tokens"] = sum(tokens)
+    out["prompt_tokens_per_eval"] = round(sum(tokens) / len(tokens)) if tokens else 0
+    out["tool_output_format"] = os.getenv("TOOL_OUTPUT_FORMAT", "json")
+    req_id = dispatch_id or getattr(ai_eval_summary.request, "id", None) or "ai-eval-upcoming"
     save_result(celery_task_id=req_id, result=json.dumps(out))
+    notify_lark_result("tasks.ai_eval_upcoming_selected_fixtures", out)
     return out
 
 
 @celery.task(name="tasks.ai_eval_upcoming_selected_fixtures")
 def ai_eval_upcoming_selected_fixtures():
     from datetime import timedelta
-    scheduled = []
+    strategy = "fundamentals"
     with SessionLocal() as session:
         now_utc = datetime.now(timezone.utc)
         start = now_utc
         end_day = (now_utc.date())
         end_dt = datetime.combine(end_day, datetime.min.time()).replace(tzinfo=timezone.utc) + timedelta(days=3)
-        rows = session.execute(
-            select(SelectedFixture).where(
+        # 已有评估的比赛也会下发，由 ai_eval_fixture 根据输入指纹决定是否重新评估
+        fixture_ids = session.execute(
+            select(SelectedFixture.fixture_id).where(
                 (SelectedFixture.match_date >= start) & (SelectedFixture.match_date < end_dt)
+                & ((SelectedFixture.status_long != "Match Finished") | (SelectedFixture.status_long.is_(None)))
             )
         ).scalars().all()
-        count = 0
-        strategy = "fundamentals"
-        for sf in rows:
-            if (sf.status_long or "") == "Match Finished":
-                continue
-            exists = session.execute(
-                select(AiEval).where(
-                    (AiEval.fixture_id == int(sf.fixture_id)) & (AiEval.strategy == strategy)
-                )
-            ).scalar_one_or_none()
-            if exists:
-                continue
-            initial_state = {
-                "messages": [HumanMessage(content=f"分析比赛id为 {int(sf.fixture_id)} 的基本面数据")],
-                "fixture_id": int(sf.fixture_id),
-                "sender": "user",
-                "fundamentals_report": "",
-                "strategy": strategy,
-            }
-            try:
-                result = graph.invoke(initial_state)
-                translations = result.get("translations") or {}
-                row = AiEval(fixture_id=int(sf.fixture_id), strategy=strategy, content=translations)
-                session.add(row)
-                session.commit()
-                count += 1
-            except Exception as e:
-                try:
-                    session.rollback()
-                except Exception:
-                    pass
-                notify_lark_error("tasks.ai_eval_upcoming_selected_fixtures", e)
-        
+    # 每场比赛一个任务，路由到独立的 ai_eval 队列，由该队列 worker 的并发数限流；全部完成后汇总
     req_id = getattr(ai_eval_upcoming_selected_fixtures.request, "id", None) or "ai-eval-upcoming"
-    out = {"evaluated": count, "strategy": "fundamentals"}
+    header = [ai_eval_fixture.s(int(fid), strategy) for fid in fixture_ids]
+    if not header:
+        return ai_eval_summary([], strategy, req_id)
+    chord(header)(ai_eval_summary.s(strategy, req_id))
+    out = {"dispatched": len(header), "strategy": strategy}
     save_result(celery_task_id=req_id, result=json.dumps(out))
-    notify_lark_result("tasks.ai_eval_upcoming_selected_fixtures", out)
     return out
@@ -0,0 +1,101 @@
+import os
+import time
+import random
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+from . import ratelimit
+
+load_dotenv()
+
+BASE_URL = "https://v3.football.api-sports.io"
+CONNECT_TIMEOUT = float(os.getenv("API_FOOTBALL_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("API_FOOTBALL_READ_TIMEOUT", "30"))
+MAX_RETRIES = int(os.getenv("API_FOOTBALL_MAX_RETRIES", "3"))
+BACKOFF_BASE = float(os.getenv("API_FOOTBALL_BACKOFF_BASE", "1"))
+BACKOFF_MAX = float(os.getenv("API_FOOTBALL_BACKOFF_MAX", "30"))
+POOL_MAXSIZE = int(os.getenv("API_FOOTBALL_POOL_MAXSIZE", "10"))
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_session = None
+_session_pid = None
+
+
+def get_session():
+    # 每个进程一个 Session；prefork 子进程不能复用父进程的连接池
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        api_key = os.getenv("API_FOOTBALL_KEY")
+        if not api_key:
+            raise ValueError("请在.env文件中设置API_FOOTBALL_KEY")
+        s = requests.Session()
+        s.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE))
+        s.headers.update({
+            "x-apisports-key": api_key,
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip, deflate",
+        })
+        _session = s
+        _session_pid = pid
+    return _session
+
+
+def _backoff_seconds(attempt: int, retry_after: str | None = None):
+    if retry_after:
+        try:
+            return min(BACKOFF_MAX, float(retry_after))
+        except ValueError:
+            pass
+    # full jitter: 在 [0, base * 2^attempt] 之间随机，避免多个 worker 同时重试
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def api_get(endpoint: str, params: dict | None = None):
+    url = f"{BASE_URL}{endpoint}"
+    attempt = 0
+    while True:
+        ratelimit.acquire()
+        try:
+            resp = get_session().get(url, params=params, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt >= MAX_RETRIES:
+                raise
+            time.sleep(_backoff_seconds(attempt))
+            attempt += 1
+            continue
+        ratelimit.observe(resp)
+        if resp.status_code in RETRY_STATUSES and attempt < MAX_RETRIES:
+            time.sleep(_backoff_seconds(attempt, resp.headers.get("Retry-After")))
+            attempt += 1
+            continue
+        resp.raise_for_status()
+        data = resp.json()
+        # API-Football 超限时可能返回 200 + errors.rateLimit
+        errors = data.get("errors") if isinstance(data, dict) else None
+        if isinstance(errors, dict) and "rateLimit" in errors and attempt < MAX_RETRIES:
+            ratelimit.drain()
+            time.sleep(_backoff_seconds(attempt))
+            attempt += 1
+            continue
+        return data
+
+
+def api_get_all(endpoint: str, params: dict | None = None):
+    # 按 paging.total 拉取所有分页，返回合并后的 response 列表
+    params = dict(params or {})
+    items = []
+    page = 1
+    while True:
+        if page > 1:
+            params["page"] = page
+        data = api_get(endpoint, params)
+        items.extend(data.get("response") or [])
+        paging = data.get("paging") or {}
+        try:
+            total = int(paging.get("total") or 1)
+        except (TypeError, ValueError):
+            total = 1
+        if page >= total:
+            return items
+        page += 1
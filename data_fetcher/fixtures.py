@@ -1,73 +1,193 @@
-import requests
-from datetime import datetime, timezone
-from sqlalchemy import select
-from app.settings import settings
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import or_, literal_column, select, text
+from sqlalchemy.sql import func
+import redis
+from sqlalchemy.dialects.postgresql import insert
 from app.db import SessionLocal
-from app.models import Fixture
+from app.models import Fixture, League
+from .api_football import api_get, api_get_all
+from .redis_client import get_redis
+from .payload_fingerprint import payload_digest, is_unchanged, remember
 
+UPSERT_CHUNK_SIZE = 500
+IDS_PER_REQUEST = 20
+CURRENT_SEASON_TTL = 24 * 3600
+FINISHED_STATUSES = {"FT", "AET", "PEN", "CANC", "ABD", "AWD", "WO"}
+LIVE_STATUSES = {"1H", "HT", "2H", "ET", "BT", "P", "SUSP", "INT", "LIVE"}
+LIVE_DELTA_COLUMNS = ("status_short", "status_long", "status_elapsed", "goals_home", "goals_away")
 
-def fetch_fixtures_for_date_data(day: str):
-    url = "https://v3.football.api-sports.io/fixtures"
-    headers = {"x-apisports-key": settings.API_FOOTBALL_KEY}
-    params = {"date": day, "timezone": "UTC"}
-    resp = requests.get(url, headers=headers, params=params, timeout=30)
-    resp.raise_for_status()
-    data = resp.json()
+
+def _fixture_values(item: dict):
+    fixt = item.get("fixture") or {}
+    league = item.get("league") or {}
+    teams = item.get("teams") or {}
+    goals = item.get("goals") or {}
+    score = item.get("score") or {}
+    fixture_id = fixt.get("id")
+    if fixture_id is None:
+        return None
+    dt = fixt.get("date")
+    match_dt = None
+    if dt:
+        try:
+            match_dt = datetime.fromisoformat(dt).astimezone(timezone.utc)
+        except Exception:
+            match_dt = None
+    return {
+        "fixture_id": fixture_id,
+        "league_id": league.get("id"),
+        "league_name": league.get("name"),
+        "country_name": league.get("country"),
+        "season": league.get("season"),
+        "round": league.get("round"),
+        "match_date": match_dt,
+        "status_short": (fixt.get("status") or {}).get("short"),
+        "status_long": (fixt.get("status") or {}).get("long"),
+        "status_elapsed": (fixt.get("status") or {}).get("elapsed"),
+        "venue_id": (fixt.get("venue") or {}).get("id"),
+        "venue_name": (fixt.get("venue") or {}).get("name"),
+        "venue_city": (fixt.get("venue") or {}).get("city"),
+        "home_team_id": (teams.get("home") or {}).get("id"),
+        "home_team_name": (teams.get("home") or {}).get("name"),
+        "away_team_id": (teams.get("away") or {}).get("id"),
+        "away_team_name": (teams.get("away") or {}).get("name"),
+        "goals_home": goals.get("home"),
+        "goals_away": goals.get("away"),
+        "halftime_home": ((score.get("halftime") or {}).get("home")),
+        "halftime_away": ((score.get("halftime") or {}).get("away")),
+        "fulltime_home": ((score.get("fulltime") or {}).get("home")),
+        "fulltime_away": ((score.get("fulltime") or {}).get("away")),
+    }
+
+
+def upsert_fixtures(session, items: list[dict]):
+    # 同一批次内按 fixture_id 去重，ON CONFLICT DO UPDATE 不允许同一行被更新两次
+    by_id = {}
+    for item in items:
+        values = _fixture_values(item)
+        if values:
+            by_id[values["fixture_id"]] = values
+    rows = list(by_id.values())
     created = 0
     updated = 0
+    table = Fixture.__table__
+    for i in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        chunk = rows[i:i + UPSERT_CHUNK_SIZE]
+        stmt = insert(Fixture).values(chunk)
+        cols = [k for k in chunk[0] if k != "fixture_id"]
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.fixture_id],
+            set_={**{k: stmt.excluded[k] for k in cols}, "updated_at": func.now()},
+            # 只有字段真正变化时才更新，未变化的行不产生写入也不会被 RETURNING 返回
+            where=or_(*[table.c[k].is_distinct_from(stmt.excluded[k]) for k in cols]),
+        ).returning(literal_column("(xmax = 0)").label("inserted"))
+        for row in session.execute(stmt):
+            if row.inserted:
+                created += 1
+            else:
+                updated += 1
+    return {"created": created, "updated": updated}
+
+
+def fetch_fixtures_for_date_data(day: str):
+    params = {"date": day, "timezone": "UTC"}
+    data = api_get("/fixtures", params)
     items = data.get("response") or []
+    # 响应与上次入库时完全一致（已结束的日期基本如此）则跳过整批对比
+    digest = payload_digest(items)
+    if is_unchanged("/fixtures", params, digest):
+        return {"created": 0, "updated": 0, "payload_unchanged": True}
     with SessionLocal() as session:
-        for item in items:
-            fixt = item.get("fixture") or {}
-            league = item.get("league") or {}
-            teams = item.get("teams") or {}
-            goals = item.get("goals") or {}
-            score = item.get("score") or {}
-            fixture_id = fixt.get("id")
-            if fixture_id is None:
-                continue
-            obj = session.execute(select(Fixture).where(Fixture.fixture_id == fixture_id)).scalar_one_or_none()
-            dt = fixt.get("date")
-            match_dt = None
-            if dt:
-                try:
-                    match_dt = datetime.fromisoformat(dt).astimezone(timezone.utc)
-                except Exception:
-                    match_dt = None
-            values = {
-                "league_id": league.get("id"),
-                "league_name": league.get("name"),
-                "country_name": league.get("country"),
-                "season": league.get("season"),
-                "round": league.get("round"),
-                "match_date": match_dt,
-                "status_short": (fixt.get("status") or {}).get("short"),
-                "status_long": (fixt.get("status") or {}).get("long"),
-                "venue_id": (fixt.get("venue") or {}).get("id"),
-                "venue_name": (fixt.get("venue") or {}).get("name"),
-                "venue_city": (fixt.get("venue") or {}).get("city"),
-                "home_team_id": (teams.get("home") or {}).get("id"),
-                "home_team_name": (teams.get("home") or {}).get("name"),
-                "away_team_id": (teams.get("away") or {}).get("id"),
-                "away_team_name": (teams.get("away") or {}).get("name"),
-                "goals_home": goals.get("home"),
-                "goals_away": goals.get("away"),
-                "halftime_home": ((score.get("halftime") or {}).get("home")),
-                "halftime_away": ((score.get("halftime") or {}).get("away")),
-                "fulltime_home": ((score.get("fulltime") or {}).get("home")),
-                "fulltime_away": ((score.get("fulltime") or {}).get("away")),
-            }
-            if obj:
-                changed = 0
-                for k, v in values.items():
-                    if getattr(obj, k) != v:
-                        setattr(obj, k, v)
-                        changed += 1
-                if changed:
-                    updated += 1
-            else:
-                obj = Fixture(fixture_id=fixture_id, **values)
-                session.add(obj)
-                created += 1
+        res = upsert_fixtures(session, items)
         session.commit()
-    return {"created": created, "updated": updated}
+    remember("/fixtures", params, digest)
+    return res
+
+
+def fetch_fixtures_by_ids_data(fixture_ids: list[int]):
+    # /fixtures?ids= 每次最多 20 个 id
+    items = []
+    ids = sorted({int(i) for i in fixture_ids})
+    for i in range(0, len(ids), IDS_PER_REQUEST):
+        chunk = ids[i:i + IDS_PER_REQUEST]
+        data = api_get("/fixtures", {"ids": "-".join(str(x) for x in chunk), "timezone": "UTC"})
+        items.extend(data.get("response") or [])
+    with SessionLocal() as session:
+        res = upsert_fixtures(session, items)
+        session.commit()
+    return {"requested": len(ids), "received": len(items), **res}
+
+
+def get_fixture_row(fixture_id: int):
+    with SessionLocal() as session:
+        return session.execute(select(Fixture).where(Fixture.fixture_id == fixture_id)).scalar_one_or_none()
+
+
+def resolve_current_season(league_id: int):
+    # 仅在本地没有任何赛季信息时使用，结果在 Redis 中缓存一天
+    r = get_redis()
+    key = f"apifootball:current_season:{league_id}"
+    if r is not None:
+        try:
+            cached = r.get(key)
+            if cached is not None:
+                return int(cached)
+        except redis.RedisError:
+            pass
+    data = api_get("/leagues", {"id": league_id, "current": "true"})
+    season = None
+    for item in data.get("response") or []:
+        for s in item.get("seasons") or []:
+            if s.get("current"):
+                season = s.get("year")
+    if season is not None and r is not None:
+        try:
+            r.set(key, season, ex=CURRENT_SEASON_TTL)
+        except redis.RedisError:
+            pass
+    return season
+
+
+def league_seasons(league_id: int, date_from: str, date_to: str):
+    # 赛季取自本地数据：窗口内已入库比赛的赛季（跨赛季时会有两个）+ leagues.current_season（每日联赛导入时更新）
+    start = datetime.fromisoformat(date_from).replace(tzinfo=timezone.utc)
+    end = datetime.fromisoformat(date_to).replace(tzinfo=timezone.utc)
+    with SessionLocal() as session:
+        seasons = set(session.execute(
+            select(Fixture.season).where(
+                (Fixture.league_id == league_id)
+                & (Fixture.match_date >= start)
+                & (Fixture.match_date < end + timedelta(days=1))
+                & Fixture.season.is_not(None)
+            ).distinct()
+        ).scalars().all())
+        current = session.execute(select(League.current_season).where(League.league_id == league_id)).scalar_one_or_none()
+        if current is None and not seasons:
+            current = session.execute(select(func.max(Fixture.season)).where(Fixture.league_id == league_id)).scalar()
+    if current is not None:
+        seasons.add(current)
+    if not seasons:
+        season = resolve_current_season(league_id)
+        if season is not None:
+            seasons.add(season)
+    return sorted(seasons)
+
+
+def fetch_fixtures_for_league_data(league_id: int, date_from: str, date_to: str, season: int | None = None):
+    # 只拉取单个联赛在日期区间内的比赛，/fixtures 按联赛查询时必须带 season
+    seasons = [season] if season else league_seasons(league_id, date_from, date_to)
+    if not seasons:
+        return {"league_id": league_id, "seasons": [], "created": 0, "updated": 0}
+    items = []
+    for s in seasons:
+        items.extend(api_get_all("/fixtures", {
+            "league": league_id,
+            "season": s,
+            "from": date_from,
+            "to": date_to,
+            "timezone": "UTC",
+        }))
+    with SessionLocal() as session:
+        res = upsert_fixtures(session, items)
+        session.commit()
+    return {"league_id": league_id, "seasons": seasons, **res}
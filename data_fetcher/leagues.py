@@ -1,17 +1,16 @@
-import requests
 from sqlalchemy import select
-from app.settings import settings
 from app.db import SessionLocal
 from app.models import League
+from .api_football import api_get
+from .payload_fingerprint import payload_digest, is_unchanged, remember
 
 
 def import_leagues_data():
-    url = "https://v3.football.api-sports.io/leagues"
-    headers = {"x-apisports-key": settings.API_FOOTBALL_KEY}
-    resp = requests.get(url, headers=headers, timeout=30)
-    resp.raise_for_status()
-    data = resp.json()
+    data = api_get("/leagues")
     items = data.get("response") or []
+    digest = payload_digest(items)
+    if is_unchanged("/leagues", {}, digest):
+        return {"created": 0, "updated": 0, "payload_unchanged": True}
     created = 0
     updated = 0
     with SessionLocal() as session:
@@ -29,6 +28,7 @@ def import_leagues_data():
                 "country_name": country.get("name"),
                 "country_code": country.get("code"),
                 "country_flag_url": country.get("flag"),
+                "current_season": next((x.get("year") for x in item.get("seasons") or [] if x.get("current")), None),
             }
             if obj:
                 changed = 0
@@ -43,4 +43,5 @@ def import_leagues_data():
                 session.add(obj)
                 created += 1
         session.commit()
+    remember("/leagues", {}, digest)
     return {"created": created, "updated": updated}
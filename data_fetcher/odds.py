@@ -1,67 +1,373 @@
-import requests
-from datetime import datetime, timezone
-from sqlalchemy import select
-from app.settings import settings
+import os
+import re
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal, InvalidOperation
+from sqlalchemy import select, text
+from sqlalchemy.sql import func
+import redis
+from sqlalchemy.dialects.postgresql import insert
 from app.db import SessionLocal
-from app.models import OddsQuote
+from app.settings import settings
+from app.models import OddsQuote, OddsLatest
+from .api_football import api_get_all
+from .redis_client import get_redis
+from .payload_fingerprint import payload_digest, is_unchanged, remember
 
+INSERT_CHUNK_SIZE = 1000
+ODDS_RETENTION_DAYS = int(os.getenv("ODDS_RETENTION_DAYS", "90"))
+LAST_VALUE_TTL = int(os.getenv("ODDS_LAST_VALUE_TTL_SECONDS", str(14 * 24 * 3600)))
+PARTITION_NAME_RE = re.compile(r"^odds_quotes_p(\d{4})(\d{2})$")
 
-def fetch_odds_for_fixture_data(fixture_id: int, bet_ids: set[int]):
-    url = "https://v3.football.api-sports.io/odds"
-    headers = {"x-apisports-key": settings.API_FOOTBALL_KEY}
-    params = {"fixture": str(fixture_id), "timezone": "UTC"}
-    resp = requests.get(url, headers=headers, params=params, timeout=30)
-    resp.raise_for_status()
-    data = resp.json()
+
+def _parse_update_time(update_str):
+    if not update_str:
+        return None
+    try:
+        return datetime.fromisoformat(update_str).astimezone(timezone.utc)
+    except Exception:
+        return None
+
+
+def _parse_odd(odd):
+    if odd is None:
+        return None
+    try:
+        return Decimal(str(odd).strip())
+    except InvalidOperation:
+        return None
+
+
+def _quote_rows(item: dict, bet_ids: set[int], fixture_id: int | None = None):
+    fid = (item.get("fixture") or {}).get("id") or fixture_id
+    if fid is None:
+        return []
+    # update_time 是分区键且参与唯一约束，缺失时按抓取时间取整到小时，保证同一小时内仍能去重
+    update_dt = _parse_update_time(item.get("update")) or datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    rows = []
+    for bm in item.get("bookmakers") or []:
+        bm_id = bm.get("id")
+        bm_name = bm.get("name")
+        for bet in bm.get("bets") or []:
+            bid = bet.get("id")
+            if bid not in bet_ids:
+                continue
+            bname = bet.get("name")
+            for v in bet.get("values") or []:
+                rows.append({
+                    "fixture_id": int(fid),
+                    "bookmaker_id": bm_id,
+                    "bookmaker_name": bm_name,
+                    "bet_id": bid,
+                    "bet_name": bname,
+                    "selection": v.get("value"),
+                    "odd": _parse_odd(v.get("odd")),
+                    "update_time": update_dt,
+                })
+    return rows
+
+
+def write_odds_quotes(session, rows: list[dict]):
+    # 依赖 uq_odds_quotes_unique 去重，一条语句写入一批报价
     inserted = 0
-    items = data.get("response") or []
-    update_str = None
-    if items:
-        update_str = items[0].get("update")
-    update_dt = None
-    if update_str:
+    for i in range(0, len(rows), INSERT_CHUNK_SIZE):
+        chunk = rows[i:i + INSERT_CHUNK_SIZE]
+        stmt = (
+            insert(OddsQuote)
+            .values(chunk)
+            .on_conflict_do_nothing(constraint="uq_odds_quotes_unique")
+            .returning(OddsQuote.id)
+        )
+        inserted += len(session.execute(stmt).all())
+    upsert_odds_latest(session, rows)
+    return {"inserted": inserted, "skipped": len(rows) - inserted}
+
+
+def upsert_odds_latest(session, rows: list[dict]):
+    # 与 odds_quotes 同一事务更新最新报价投影；只接受不比现有更旧的报价
+    latest = {}
+    for r in rows:
+        if r["bookmaker_id"] is None or r["bet_id"] is None or r["selection"] is None:
+            continue
+        key = (r["fixture_id"], r["bookmaker_id"], r["bet_id"], r["selection"])
+        if key not in latest or r["update_time"] >= latest[key]["update_time"]:
+            latest[key] = r
+    values = list(latest.values())
+    table = OddsLatest.__table__
+    for i in range(0, len(values), INSERT_CHUNK_SIZE):
+        stmt = insert(OddsLatest).values(values[i:i + INSERT_CHUNK_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.fixture_id, table.c.bookmaker_id, table.c.bet_id, table.c.selection],
+            set_={
+                "bookmaker_name": stmt.excluded.bookmaker_name,
+                "bet_name": stmt.excluded.bet_name,
+                "odd": stmt.excluded.odd,
+                "update_time": stmt.excluded.update_time,
+                "fetched_at": func.now(),
+            },
+            where=stmt.excluded.update_time >= table.c.update_time,
+        )
+        session.execute(stmt)
+
+
+def odds_refresh_tiers():
+    # ODDS_REFRESH_TIERS："距开赛小时数:刷新间隔分钟"，按小时数从大到小排列
+    tiers = []
+    for part in settings.ODDS_REFRESH_TIERS.split(","):
+        hours, _, minutes = part.strip().partition(":")
         try:
-            update_dt = datetime.fromisoformat(update_str).astimezone(timezone.utc)
-        except Exception:
-            update_dt = None
+            tiers.append((float(hours), float(minutes)))
+        except ValueError:
+            continue
+    return sorted(tiers, reverse=True)
+
+
+def odds_refresh_interval(time_to_kickoff, tiers=None):
+    hours = time_to_kickoff.total_seconds() / 3600
+    for threshold, minutes in tiers or odds_refresh_tiers():
+        if hours > threshold:
+            return timedelta(minutes=minutes)
+    return timedelta(minutes=5)
+
+
+def _odds_digest(items: list[dict]):
+    # 每次响应的 update 时间戳都会变化，去掉后只对比赛和报价内容做哈希
+    stripped = [{k: v for k, v in it.items() if k != "update"} for it in items]
+    return payload_digest(sorted(stripped, key=lambda it: (it.get("fixture") or {}).get("id") or 0))
+
+
+def _persist_unless_unchanged(key_params: dict, items: list[dict], rows: list[dict]):
+    digest = _odds_digest(items)
+    if is_unchanged("/odds", key_params, digest):
+        # 报价未变化，只刷新 fetched_at 表示刚确认过
+        with SessionLocal() as session:
+            touch_odds_latest(session, rows)
+            session.commit()
+        return {"inserted": 0, "skipped": 0, "unchanged": len(rows), "payload_unchanged": True}
+    res = persist_quotes(rows)
+    remember("/odds", key_params, digest)
+    return res
+
+
+def _bets_param(bet_ids: set[int]):
+    # 保留哪些报价取决于 bet_ids，指纹键需要带上
+    return ",".join(str(b) for b in sorted(bet_ids))
+
+
+def fetch_odds_for_fixture_data(fixture_id: int, bet_ids: set[int]):
+    params = {"fixture": str(fixture_id), "timezone": "UTC"}
+    items = api_get_all("/odds", params)
+    rows = []
+    for it in items:
+        rows.extend(_quote_rows(it, bet_ids, fixture_id))
+    return _persist_unless_unchanged({**params, "bets": _bets_param(bet_ids)}, items, rows)
+
+
+def fetch_odds_for_league_data(league_id: int, season: int, bet_ids: set[int], fixture_ids: set[int] | None = None):
+    # 一次按联赛+赛季分页拉取全部赔率，只保留需要的比赛
+    params = {"league": str(league_id), "season": str(season), "timezone": "UTC"}
+    items = api_get_all("/odds", params)
+    kept = []
+    rows = []
+    matched = set()
+    for it in items:
+        fid = (it.get("fixture") or {}).get("id")
+        if fid is None or (fixture_ids is not None and int(fid) not in fixture_ids):
+            continue
+        matched.add(int(fid))
+        kept.append(it)
+        rows.extend(_quote_rows(it, bet_ids))
+    # 只对保留下来的比赛做哈希，已选比赛集合变化时指纹随之变化
+    return {"fixtures": len(matched), **_persist_unless_unchanged({**params, "bets": _bets_param(bet_ids)}, kept, rows)}
+
+
+def _last_value_key(fixture_id: int):
+    return f"odds:last:{fixture_id}"
+
+
+def _quote_field(r: dict):
+    return f"{r['bookmaker_id']}:{r['bet_id']}:{r['selection']}"
+
+
+def _odd_str(odd):
+    # 与 NUMERIC(10, 3) 的存储精度一致，避免 "1.9" 和 "1.900" 被当作变化
+    if odd is None:
+        return ""
+    return str(Decimal(odd).quantize(Decimal("0.001")))
+
+
+def filter_changed_quotes(session, rows: list[dict]):
+    # 与每场比赛的 Redis 哈希（上次已知报价）对比，只返回价格真正变化的报价；
+    # 哈希为空时用 odds_latest 预热
+    r = get_redis()
+    if r is None or not rows:
+        return rows, 0, {}
+    fixture_ids = sorted({row["fixture_id"] for row in rows})
+    try:
+        pipe = r.pipeline()
+        for fid in fixture_ids:
+            pipe.hgetall(_last_value_key(fid))
+        cached = {fid: {k.decode(): v.decode() for k, v in h.items()} for fid, h in zip(fixture_ids, pipe.execute())}
+    except redis.RedisError:
+        return rows, 0, {}
+    cold = [fid for fid, h in cached.items() if not h]
+    if cold:
+        for q in session.execute(select(OddsLatest).where(OddsLatest.fixture_id.in_(cold))).scalars():
+            cached[q.fixture_id][_quote_field({"bookmaker_id": q.bookmaker_id, "bet_id": q.bet_id, "selection": q.selection})] = _odd_str(q.odd)
+    changed = []
+    pending = {}
+    for row in rows:
+        field = _quote_field(row)
+        value = _odd_str(row["odd"])
+        if cached[row["fixture_id"]].get(field) == value:
+            continue
+        changed.append(row)
+        pending.setdefault(row["fixture_id"], {})[field] = value
+    # 预热得到的值也写回 Redis，下次不用再查表
+    for fid in cold:
+        pending[fid] = {**cached[fid], **pending.get(fid, {})}
+    return changed, len(rows) - len(changed), pending
+
+
+def remember_last_values(pending: dict):
+    r = get_redis()
+    if r is None or not pending:
+        return
+    try:
+        pipe = r.pipeline()
+        for fid, mapping in pending.items():
+            if mapping:
+                pipe.hset(_last_value_key(fid), mapping=mapping)
+                pipe.expire(_last_value_key(fid), LAST_VALUE_TTL)
+        pipe.execute()
+    except redis.RedisError:
+        pass
+
+
+def touch_odds_latest(session, rows: list[dict]):
+    # 价格未变的报价不写入，但仍刷新 fetched_at，表示这些价格刚确认过；
+    # 只刷新本次响应中出现的报价，已下架的盘口保持原 fetched_at
+    keys = sorted({
+        (r["fixture_id"], r["bookmaker_id"], r["bet_id"], r["selection"])
+        for r in rows
+        if r["bookmaker_id"] is not None and r["bet_id"] is not None and r["selection"] is not None
+    })
+    if not keys:
+        return
+    fixture_ids, bookmaker_ids, bet_ids, selections = (list(c) for c in zip(*keys))
+    session.execute(
+        text(
+            """
+            UPDATE odds_latest l
+            SET fetched_at = now()
+            FROM unnest(
+                CAST(:fixture_ids AS integer[]), CAST(:bookmaker_ids AS integer[]),
+                CAST(:bet_ids AS integer[]), CAST(:selections AS varchar[])
+            ) AS k(fixture_id, bookmaker_id, bet_id, selection)
+            WHERE l.fixture_id = k.fixture_id
+              AND l.bookmaker_id = k.bookmaker_id
+              AND l.bet_id = k.bet_id
+              AND l.selection = k.selection
+            """
+        ),
+        {"fixture_ids": fixture_ids, "bookmaker_ids": bookmaker_ids, "bet_ids": bet_ids, "selections": selections},
+    )
+
+
+def persist_quotes(rows: list[dict]):
+    with SessionLocal() as session:
+        changed, unchanged, pending = filter_changed_quotes(session, rows)
+        res = write_odds_quotes(session, changed)
+        touch_odds_latest(session, rows)
+        session.commit()
+    # 提交成功后才更新上次已知报价，失败时下次会重新写入
+    remember_last_values(pending)
+    return {**res, "unchanged": unchanged}
+
+
+def get_latest_quotes(fixture_id: int, bet_id: int, bookmaker_names: set[str] | None = None):
+    stmt = select(OddsLatest).where((OddsLatest.fixture_id == fixture_id) & (OddsLatest.bet_id == bet_id))
+    if bookmaker_names:
+        stmt = stmt.where(OddsLatest.bookmaker_name.in_(bookmaker_names))
+    with SessionLocal() as session:
+        return session.execute(stmt).scalars().all()
+
+
+def get_latest_odds(fixture_ids: list[int], bet_id: int | None = None):
+    # 按主键前缀直接查 odds_latest，与历史数据量无关
+    stmt = select(OddsLatest).where(OddsLatest.fixture_id.in_(fixture_ids))
+    if bet_id is not None:
+        stmt = stmt.where(OddsLatest.bet_id == bet_id)
+    stmt = stmt.order_by(OddsLatest.fixture_id, OddsLatest.bookmaker_id, OddsLatest.bet_id, OddsLatest.selection)
+    out = {int(fid): [] for fid in fixture_ids}
+    with SessionLocal() as session:
+        for q in session.execute(stmt).scalars():
+            out[q.fixture_id].append({
+                "bookmaker_id": q.bookmaker_id,
+                "bookmaker_name": q.bookmaker_name,
+                "bet_id": q.bet_id,
+                "bet_name": q.bet_name,
+                "selection": q.selection,
+                "odd": float(q.odd) if q.odd is not None else None,
+                "update_time": q.update_time.isoformat() if q.update_time else None,
+                "fetched_at": q.fetched_at.isoformat() if q.fetched_at else None,
+            })
+    return out
+
+
+def ensure_odds_partitions(months_ahead: int = 2):
+    # 提前建好当前及未来几个月的分区，避免数据落入 default 分区
+    now = datetime.now(timezone.utc).date().replace(day=1)
+    created = []
     with SessionLocal() as session:
-        for it in items:
-            bms = it.get("bookmakers") or []
-            for bm in bms:
-                bm_id = bm.get("id")
-                bm_name = bm.get("name")
-                bets = bm.get("bets") or []
-                for bet in bets:
-                    bid = bet.get("id")
-                    if bid not in bet_ids:
-                        continue
-                    bname = bet.get("name")
-                    vals = bet.get("values") or []
-                    for v in vals:
-                        sel = v.get("value")
-                        odd = v.get("odd")
-                        exists = session.execute(
-                            select(OddsQuote).where(
-                                OddsQuote.fixture_id == fixture_id,
-                                OddsQuote.bookmaker_id == bm_id,
-                                OddsQuote.bet_id == bid,
-                                OddsQuote.selection == sel,
-                                OddsQuote.update_time == update_dt,
-                            )
-                        ).scalar_one_or_none()
-                        if exists:
-                            continue
-                        obj = OddsQuote(
-                            fixture_id=fixture_id,
-                            bookmaker_id=bm_id,
-                            bookmaker_name=bm_name,
-                            bet_id=bid,
-                            bet_name=bname,
-                            selection=sel,
-                            odd=odd,
-                            update_time=update_dt,
-                        )
-                        session.add(obj)
-                        inserted += 1
+        for i in range(months_ahead + 1):
+            year = now.year + (now.month - 1 + i) // 12
+            month = (now.month - 1 + i) % 12 + 1
+            created.append(session.execute(
+                text("SELECT ensure_odds_quotes_partition(:d)"), {"d": now.replace(year=year, month=month)}
+            ).scalar())
         session.commit()
-    return {"inserted": inserted}
+    return created
+
+
+def compact_old_odds_partitions(retention_days: int = ODDS_RETENTION_DAYS):
+    # 超过保留期的分区只保留每个 (fixture, bookmaker, bet, selection) 的开盘和收盘报价；
+    # 开盘/收盘在整张 odds_quotes 上判断，跨月的比赛在较早月份中不会多留一条"收盘"报价
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    compacted = []
+    with SessionLocal() as session:
+        parts = session.execute(text(
+            """
+            SELECT c.relname, obj_description(c.oid, 'pg_class')
+            FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'odds_quotes'::regclass
+            """
+        )).all()
+        for name, comment in parts:
+            m = PARTITION_NAME_RE.match(name)
+            if not m or comment == "compacted":
+                continue
+            year, month = int(m.group(1)), int(m.group(2))
+            upper = datetime(year + month // 12, month % 12 + 1, 1, tzinfo=timezone.utc)
+            if upper > cutoff:
+                continue
+            deleted = session.execute(text(
+                f"""
+                DELETE FROM {name} q
+                WHERE EXISTS (
+                  SELECT 1 FROM odds_quotes a
+                  WHERE a.fixture_id = q.fixture_id AND a.bookmaker_id IS NOT DISTINCT FROM q.bookmaker_id
+                    AND a.bet_id IS NOT DISTINCT FROM q.bet_id AND a.selection IS NOT DISTINCT FROM q.selection
+                    AND a.update_time < q.update_time
+                )
+                AND EXISTS (
+                  SELECT 1 FROM odds_quotes a
+                  WHERE a.fixture_id = q.fixture_id AND a.bookmaker_id IS NOT DISTINCT FROM q.bookmaker_id
+                    AND a.bet_id IS NOT DISTINCT FROM q.bet_id AND a.selection IS NOT DISTINCT FROM q.selection
+                    AND a.update_time > q.update_time
+                )
+                """
+            )).rowcount
+            session.execute(text(f"COMMENT ON TABLE {name} IS 'compacted'"))
+            session.commit()
+            compacted.append({"partition": name, "deleted": deleted})
+    return compacted
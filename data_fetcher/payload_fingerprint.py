@@ -0,0 +1,48 @@
+import os
+import json
+import hashlib
+import redis
+from .redis_client import get_redis, params_digest, record_hit, hit_miss_stats
+
+FINGERPRINT_PREFIX = "apifootball:fingerprint"
+STATS_KEY = "apifootball:fingerprint:stats"
+FINGERPRINT_TTL = int(os.getenv("PAYLOAD_FINGERPRINT_TTL_SECONDS", str(3 * 24 * 3600)))
+
+
+def _key(endpoint: str, params: dict):
+    return f"{FINGERPRINT_PREFIX}:{endpoint}:{params_digest(params)}"
+
+
+def payload_digest(payload):
+    # 只对 response 内容做哈希，排序键后与字段顺序无关；易变字段由调用方先去掉
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def is_unchanged(endpoint: str, params: dict, digest: str):
+    # 与上次成功入库的响应哈希一致时返回 True；Redis 不可用时视为已变化
+    r = get_redis()
+    if r is None:
+        return False
+    try:
+        stored = r.get(_key(endpoint, params))
+    except redis.RedisError:
+        return False
+    hit = stored is not None and stored.decode() == digest
+    record_hit(STATS_KEY, endpoint, hit)
+    return hit
+
+
+def remember(endpoint: str, params: dict, digest: str):
+    # 只在入库提交成功后调用，失败时下次会完整处理
+    r = get_redis()
+    if r is None:
+        return
+    try:
+        r.set(_key(endpoint, params), digest, ex=FINGERPRINT_TTL)
+    except redis.RedisError:
+        pass
+
+
+def fingerprint_stats():
+    return hit_miss_stats(STATS_KEY)
@@ -0,0 +1,153 @@
+import os
+import time
+import random
+from datetime import datetime, timedelta, timezone
+import redis
+import requests
+from .redis_client import get_redis
+
+BUCKET_KEY = "apifootball:ratelimit:bucket"
+STATE_KEY = "apifootball:ratelimit:state"
+DAILY_EXHAUSTED_KEY = "apifootball:ratelimit:daily_exhausted"
+DEFAULT_PER_MINUTE = int(os.getenv("API_FOOTBALL_RATE_PER_MINUTE", "30"))
+HEADROOM = float(os.getenv("API_FOOTBALL_RATE_HEADROOM", "0.9"))
+MAX_WAIT = float(os.getenv("API_FOOTBALL_RATE_MAX_WAIT", "120"))
+
+# 令牌桶：容量 = 每分钟限额，按毫秒匀速回填；使用 Redis 服务器时间避免各 worker 时钟偏差
+# 返回 0 表示拿到令牌，-1 表示当日额度已用完，否则返回需要等待的毫秒数
+_ACQUIRE_LUA = """
+if redis.call('EXISTS', KEYS[3]) == 1 then
+  return -1
+end
+local capacity = tonumber(redis.call('HGET', KEYS[2], 'per_minute') or ARGV[1])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local rate = capacity / 60000
+local b = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(b[1]) or capacity
+local ts = tonumber(b[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+else
+  wait = math.ceil((1 - tokens) / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], 120000)
+return wait
+"""
+
+# 清空令牌桶并把 ts 设为服务器当前时间，之后只按清空后的时间回填
+_DRAIN_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+redis.call('HSET', KEYS[1], 'tokens', '0', 'ts', now)
+redis.call('PEXPIRE', KEYS[1], 120000)
+return 0
+"""
+
+_scripts = {}
+
+
+class DailyQuotaExhausted(requests.exceptions.RequestException):
+    """当日 API 额度已用完，到 UTC 零点重置前不再发请求"""
+
+
+def _script(r, name="acquire"):
+    script = _scripts.get(name)
+    if script is None or script.registered_client is not r:
+        script = _scripts[name] = r.register_script(_ACQUIRE_LUA if name == "acquire" else _DRAIN_LUA)
+    return script
+
+
+def acquire():
+    # 拿不到令牌时阻塞等待而不是失败；Redis 不可用或等待超过 MAX_WAIT 时直接放行，交给 429 重试兜底；
+    # 当日额度用完时抛出 DailyQuotaExhausted
+    r = get_redis()
+    if r is None:
+        return
+    deadline = time.monotonic() + MAX_WAIT
+    while True:
+        try:
+            wait_ms = int(_script(r)(keys=[BUCKET_KEY, STATE_KEY, DAILY_EXHAUSTED_KEY], args=[DEFAULT_PER_MINUTE]))
+        except redis.RedisError:
+            return
+        if wait_ms < 0:
+            raise DailyQuotaExhausted("API-Football daily request quota exhausted")
+        if wait_ms <= 0:
+            return
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        time.sleep(min(remaining, wait_ms / 1000.0 + random.uniform(0, 0.05)))
+
+
+def _header_int(headers, name):
+    v = headers.get(name)
+    if v is None:
+        return None
+    try:
+        return int(v)
+    except ValueError:
+        return None
+
+
+def observe(resp):
+    # 从 x-ratelimit-* 响应头学习每分钟限额，并在额度耗尽或 429 时清空令牌桶，让所有 worker 一起退避
+    r = get_redis()
+    if r is None:
+        return
+    headers = resp.headers
+    per_minute = _header_int(headers, "x-ratelimit-limit")
+    minute_remaining = _header_int(headers, "x-ratelimit-remaining")
+    daily_limit = _header_int(headers, "x-ratelimit-requests-limit")
+    daily_remaining = _header_int(headers, "x-ratelimit-requests-remaining")
+    state = {}
+    if per_minute:
+        state["per_minute"] = max(1, int(per_minute * HEADROOM))
+    if minute_remaining is not None:
+        state["minute_remaining"] = minute_remaining
+    if daily_limit is not None:
+        state["daily_limit"] = daily_limit
+    if daily_remaining is not None:
+        state["daily_remaining"] = daily_remaining
+    try:
+        pipe = r.pipeline()
+        if state:
+            pipe.hset(STATE_KEY, mapping=state)
+        if daily_remaining == 0:
+            # 当日额度按 UTC 零点重置，在此之前所有 worker 都停止请求
+            now = datetime.now(timezone.utc)
+            reset = datetime(now.year, now.month, now.day, tzinfo=timezone.utc) + timedelta(days=1)
+            pipe.set(DAILY_EXHAUSTED_KEY, 1, ex=max(1, int((reset - now).total_seconds())))
+        pipe.execute()
+    except redis.RedisError:
+        pass
+    if resp.status_code == 429 or minute_remaining == 0:
+        drain()
+
+
+def drain():
+    r = get_redis()
+    if r is None:
+        return
+    try:
+        _script(r, "drain")(keys=[BUCKET_KEY])
+    except redis.RedisError:
+        pass
+
+
+def limiter_state():
+    r = get_redis()
+    if r is None:
+        return {}
+    try:
+        raw = r.hgetall(STATE_KEY)
+    except redis.RedisError:
+        return {}
+    try:
+        exhausted = bool(r.exists(DAILY_EXHAUSTED_KEY))
+    except redis.RedisError:
+        exhausted = False
+    return {**{k.decode(): int(v) for k, v in raw.items()}, "daily_exhausted": exhausted}
@@ -0,0 +1,58 @@
+import os
+import json
+import hashlib
+import redis
+from dotenv import load_dotenv
+
+load_dotenv()
+
+_client = None
+_client_pid = None
+
+
+def get_redis():
+    # 未配置 REDIS_URL 时返回 None，调用方应退化为不使用 Redis
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is None or _client_pid != pid:
+        url = os.getenv("REDIS_URL")
+        if not url:
+            return None
+        _client = redis.Redis.from_url(url, socket_timeout=5, socket_connect_timeout=5)
+        _client_pid = pid
+    return _client
+
+
+def params_digest(params: dict):
+    # 参数统一转成字符串并排序，保证 {'team': 33} 与 {'team': '33'} 得到同一个键
+    normalized = json.dumps({str(k): str(v) for k, v in (params or {}).items()}, sort_keys=True)
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def record_hit(stats_key: str, endpoint: str, hit: bool):
+    r = get_redis()
+    if r is None:
+        return
+    try:
+        r.hincrby(stats_key, f"{endpoint}:{'hit' if hit else 'miss'}", 1)
+    except redis.RedisError:
+        pass
+
+
+def hit_miss_stats(stats_key: str):
+    # 读取 record_hit 写入的计数，返回 {endpoint: {'hit': n, 'miss': n, 'hit_rate': x}}
+    r = get_redis()
+    if r is None:
+        return {}
+    try:
+        raw = r.hgetall(stats_key)
+    except redis.RedisError:
+        return {}
+    stats = {}
+    for k, v in raw.items():
+        endpoint, _, kind = k.decode().rpartition(":")
+        stats.setdefault(endpoint, {"hit": 0, "miss": 0})[kind] = int(v)
+    for s in stats.values():
+        total = s["hit"] + s["miss"]
+        s["hit_rate"] = round(s["hit"] / total, 4) if total else 0.0
+    return stats
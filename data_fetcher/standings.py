@@ -0,0 +1,131 @@
+import os
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select
+from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import insert
+from app.db import SessionLocal
+from app.models import Standing, StandingsFetch
+from .api_football import api_get
+
+STANDINGS_MAX_AGE = timedelta(seconds=int(os.getenv("STANDINGS_MAX_AGE_SECONDS", str(6 * 3600))))
+
+
+def _format_team_standing(league_info: dict, team_standing: dict):
+    return {
+        "league_id": league_info["id"],
+        "league_name": league_info["name"],
+        "league_country": league_info["country"],
+        "league_season": league_info["season"],
+        "team_id": team_standing["team"]["id"],
+        "team_name": team_standing["team"]["name"],
+        "rank": team_standing["rank"],
+        "points": team_standing["points"],
+        "goalsDiff": team_standing["goalsDiff"],
+        "group": team_standing["group"],
+        "form": team_standing["form"],
+        "status": team_standing["status"],
+        "description": team_standing["description"],
+        "all_played": team_standing["all"]["played"],
+        "all_win": team_standing["all"]["win"],
+        "all_draw": team_standing["all"]["draw"],
+        "all_lose": team_standing["all"]["lose"],
+        "all_goals_for": team_standing["all"]["goals"]["for"],
+        "all_goals_against": team_standing["all"]["goals"]["against"],
+        "home_played": team_standing["home"]["played"],
+        "home_win": team_standing["home"]["win"],
+        "home_draw": team_standing["home"]["draw"],
+        "home_lose": team_standing["home"]["lose"],
+        "home_goals_for": team_standing["home"]["goals"]["for"],
+        "home_goals_against": team_standing["home"]["goals"]["against"],
+        "away_played": team_standing["away"]["played"],
+        "away_win": team_standing["away"]["win"],
+        "away_draw": team_standing["away"]["draw"],
+        "away_lose": team_standing["away"]["lose"],
+        "away_goals_for": team_standing["away"]["goals"]["for"],
+        "away_goals_against": team_standing["away"]["goals"]["against"],
+    }
+
+
+def fetch_standings_data(league_id: int, season: int):
+    # 整个联赛的积分榜只下载一次，按 team_id 展开存储
+    data = api_get("/standings", {"league": league_id, "season": season})
+    by_team = {}
+    for league_standing in data.get("response") or []:
+        league_info = league_standing.get("league") or {}
+        for standing_group in league_info.get("standings") or []:
+            for team_standing in standing_group:
+                try:
+                    row = _format_team_standing(league_info, team_standing)
+                except (KeyError, TypeError):
+                    continue
+                # 同一球队出现在多个分组时保留第一次出现的记录
+                by_team.setdefault(row["team_id"], row)
+    rows = [
+        {
+            "league_id": league_id,
+            "season": season,
+            "team_id": team_id,
+            "rank": row["rank"],
+            "points": row["points"],
+            "data": row,
+        }
+        for team_id, row in by_team.items()
+    ]
+    # 记录本次拉取时间；杯赛等没有积分榜、或球队不在榜上时据此判断无需重复请求 /standings
+    fetched = insert(StandingsFetch).values(league_id=league_id, season=season)
+    fetched = fetched.on_conflict_do_update(
+        index_elements=["league_id", "season"],
+        set_={"fetched_at": func.now()},
+    )
+    with SessionLocal() as session:
+        if rows:
+            stmt = insert(Standing).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_standings_league_season_team",
+                set_={
+                    "rank": stmt.excluded.rank,
+                    "points": stmt.excluded.points,
+                    "data": stmt.excluded.data,
+                    "updated_at": func.now(),
+                },
+            )
+            session.execute(stmt)
+        session.execute(fetched)
+        session.commit()
+    return {"league_id": league_id, "season": season, "teams": len(by_team)}
+
+
+def get_team_standing(league_id: int, season: int, team_id: int):
+    # 本地按 (league_id, season, team_id) 直接查；球队行缺失或过期、且近期未拉取过整表时刷新一次再查
+    def lookup():
+        with SessionLocal() as session:
+            return session.execute(
+                select(Standing.data, Standing.updated_at).where(
+                    (Standing.league_id == league_id) & (Standing.season == season) & (Standing.team_id == team_id)
+                )
+            ).first()
+
+    def last_fetched():
+        with SessionLocal() as session:
+            return session.execute(
+                select(StandingsFetch.fetched_at).where(
+                    (StandingsFetch.league_id == league_id) & (StandingsFetch.season == season)
+                )
+            ).scalar_one_or_none()
+
+    def fresh(ts):
+        return ts is not None and ts >= datetime.now(timezone.utc) - STANDINGS_MAX_AGE
+
+    row = lookup()
+    if row is not None and fresh(row.updated_at):
+        return row.data
+    if fresh(last_fetched()):
+        # 近期已拉取过整表但该球队不在榜上（或已被移出），不再重复请求
+        return row.data if row is not None else {}
+    try:
+        fetch_standings_data(league_id, season)
+    except Exception:
+        # 刷新失败时退回到已有的（可能过期的）数据
+        return row.data if row is not None else {}
+    row = lookup()
+    return row.data if row is not None else {}
@@ -0,0 +1,50 @@
+import json
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from agent.api_football_tools import prefetch_fixture_inputs  # noqa: E402
+from agent.compact import compact_rows, compact_record  # noqa: E402
+
+
+def count_tokens(text: str) -> int:
+    try:
+        import tiktoken
+        return len(tiktoken.get_encoding("o200k_base").encode(text))
+    except Exception:
+        # 没有 tiktoken 时按 4 字符 ≈ 1 token 估算
+        return len(text) // 4
+
+
+def to_compact(inputs: dict) -> dict:
+    out = {}
+    for name, value in inputs.items():
+        if isinstance(value, list):
+            out[name] = compact_rows(value)
+        elif isinstance(value, dict) and name.startswith("get_standing"):
+            out[name] = compact_record(value)
+        else:
+            out[name] = value
+    return out
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("usage: python compare_tool_encoding.py <fixture_id>", file=sys.stderr)
+        sys.exit(2)
+    # 需在 TOOL_OUTPUT_FORMAT=json（默认）下运行，拿到原始结构再分别编码
+    inputs = prefetch_fixture_inputs(int(sys.argv[1]))
+    verbose = json.dumps(inputs, ensure_ascii=False, default=str)
+    compact = json.dumps(to_compact(inputs), ensure_ascii=False, separators=(",", ":"), default=str)
+    before = count_tokens(verbose)
+    after = count_tokens(compact)
+    print(json.dumps({
+        "json_tokens": before,
+        "compact_tokens": after,
+        "saved_pct": round(100 * (before - after) / before, 1) if before else 0,
+    }))
+
+
+if __name__ == "__main__":
+    main()
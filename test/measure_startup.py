@@ -0,0 +1,34 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+# 在独立子进程中导入模块，测量导入耗时和常驻内存峰值（ru_maxrss, Linux 下单位为 KB）
+PROBE = """
+import json, resource, sys, time
+t0 = time.perf_counter()
+__import__(sys.argv[1])
+elapsed = time.perf_counter() - t0
+print(json.dumps({
+    "module": sys.argv[1],
+    "import_seconds": round(elapsed, 3),
+    "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    "agent_loaded": "agent.match_fundamentals_analyst" in sys.modules,
+    "langgraph_loaded": "langgraph" in sys.modules,
+}))
+"""
+
+
+def main():
+    modules = sys.argv[1:] or ["app.main", "app.tasks", "agent.match_fundamentals_analyst"]
+    root = Path(__file__).resolve().parents[1]
+    for mod in modules:
+        proc = subprocess.run([sys.executable, "-c", PROBE, mod], cwd=root, capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(json.dumps({"module": mod, "error": proc.stderr.strip().splitlines()[-1:]}))
+            continue
+        print(proc.stdout.strip())
+
+
+if __name__ == "__main__":
+    main()